@@ -0,0 +1,210 @@
+"""
+Admission Control 🐉
+Per-router concurrency limits, per-client rate limiting and load shedding
+
+Each router gets its own AdmissionController, attached as a router-level
+dependency. A request has to pass three gates before it reaches the route:
+
+1. Token bucket per client (IP) -> 429 + Retry-After when the bucket is empty
+2. Concurrency slot for the router -> waits in line for a free slot
+3. Queue-time budget -> 503 + Retry-After if it waited too long for a slot
+
+Limits can be tuned per router through environment variables, e.g.
+ADMISSION_AUTH_MAX_CONCURRENCY=4 or ADMISSION_TASKS_RATE=100.
+"""
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from fastapi import HTTPException, Request
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a numeric setting from the environment, falling back to the default"""
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+class TokenBucket:
+    """Classic token bucket: `rate` tokens per second, holding at most `burst` tokens"""
+
+    __slots__ = ("rate", "burst", "tokens", "updated_at")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = now
+
+    def take(self, now: float) -> float:
+        """
+        Try to take one token.
+
+        Returns 0 when the token was granted, otherwise the number of seconds
+        until the next token becomes available.
+        """
+        # Refill based on how much time passed since we last looked
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+        self.updated_at = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """
+    Admission control for a single router 🐉
+
+    Use an instance as a router dependency:
+
+        admission = AdmissionController.from_env("tasks", max_concurrency=64)
+        router = APIRouter(dependencies=[Depends(admission)])
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        max_queue_time: float,
+        rate: float,
+        burst: float,
+        max_clients: int = 10_000,
+    ):
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.max_queue_time = max_queue_time
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+
+        # Buckets per client, oldest first so we can evict idle clients cheaply
+        self._buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+
+        # The semaphore is created lazily so it is bound to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters for monitoring
+        self.admitted = 0
+        self.rate_limited = 0
+        self.shed = 0
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queue_wait = 0.0
+
+    @classmethod
+    def from_env(
+        cls,
+        name: str,
+        max_concurrency: int,
+        max_queue_time: float,
+        rate: float,
+        burst: float,
+    ) -> "AdmissionController":
+        """Build a controller whose defaults can be overridden with ADMISSION_<NAME>_* env vars"""
+        prefix = f"ADMISSION_{name.upper()}_"
+        return cls(
+            name=name,
+            max_concurrency=int(_env_number(prefix + "MAX_CONCURRENCY", max_concurrency)),
+            max_queue_time=_env_number(prefix + "MAX_QUEUE_TIME", max_queue_time),
+            rate=_env_number(prefix + "RATE", rate),
+            burst=_env_number(prefix + "BURST", burst),
+        )
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore for the current event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    def _check_rate(self, client_key: str) -> None:
+        """Charge one token to the client, raising 429 if they are over their rate"""
+        now = time.monotonic()
+        bucket = self._buckets.get(client_key)
+        if bucket is None:
+            bucket = TokenBucket(self.rate, self.burst, now)
+            self._buckets[client_key] = bucket
+            # Forget the least recently seen clients once we track too many
+            while len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client_key)
+
+        wait = bucket.take(now)
+        if wait > 0:
+            self.rate_limited += 1
+            raise HTTPException(
+                status_code=429,
+                detail="too many requests",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))},
+            )
+
+    async def __call__(self, request: Request):
+        """FastAPI dependency: admit the request or shed it"""
+        client_key = request.client.host if request.client else "anonymous"
+        self._check_rate(client_key)
+
+        semaphore = self._get_semaphore()
+        started = time.monotonic()
+        self.queued += 1
+        try:
+            await asyncio.wait_for(semaphore.acquire(), timeout=self.max_queue_time)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            raise HTTPException(
+                status_code=503,
+                detail="server busy, please retry",
+                headers={"Retry-After": str(max(1, math.ceil(self.max_queue_time)))},
+            )
+        finally:
+            self.queued -= 1
+            self.max_queue_wait = max(self.max_queue_wait, time.monotonic() - started)
+
+        self.admitted += 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of the counters for the monitoring endpoint"""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "max_queue_time": self.max_queue_time,
+            "rate": self.rate,
+            "burst": self.burst,
+            "admitted": self.admitted,
+            "rate_limited": self.rate_limited,
+            "shed": self.shed,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queue_wait": round(self.max_queue_wait, 4),
+            "tracked_clients": len(self._buckets),
+        }
+
+
+# Registry of every controller, so main.py can expose them all in one place
+_controllers: Dict[str, AdmissionController] = {}
+
+
+def register(controller: AdmissionController) -> AdmissionController:
+    """Remember a controller so its counters show up in admission_stats()"""
+    _controllers[controller.name] = controller
+    return controller
+
+
+def admission_stats() -> Dict[str, Dict[str, float]]:
+    """Counters for every registered router"""
+    return {name: controller.stats() for name, controller in _controllers.items()}
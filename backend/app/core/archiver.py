@@ -0,0 +1,71 @@
+"""
+Task Archiver 🐉
+Moves old completed tasks from the hot `tasks` collection into `tasks_archive`
+
+Completed tasks are rarely read again, but while they sit in `tasks` they
+bloat every index in Task.Settings.indexes. The archiver runs in the
+background and moves them over in small, throttled batches:
+
+1. find up to `batch_size` completed tasks not updated for `older_than`
+2. bulk upsert them into the archive (replacing any stale copy there)
+3. delete them from the hot collection, but only if their updated_at
+   still matches - a task edited (or deleted) mid-move keeps its hot
+   state, and its just-written archive copy is removed again
+4. sleep `pause` seconds so we don't hog the connection pool
+
+Steps 1-3 are one archive_completed() call on the task repository.
+
+Settings (env vars): ARCHIVE_AFTER_DAYS, ARCHIVE_BATCH_SIZE,
+ARCHIVE_BATCH_PAUSE, ARCHIVE_INTERVAL.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.repositories import task_repository
+
+ARCHIVE_AFTER_DAYS = float(os.getenv("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+ARCHIVE_BATCH_PAUSE = float(os.getenv("ARCHIVE_BATCH_PAUSE", "0.5"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "3600"))
+
+
+async def archive_completed_tasks(
+    older_than: timedelta = timedelta(days=ARCHIVE_AFTER_DAYS),
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    pause: float = ARCHIVE_BATCH_PAUSE,
+    max_batches: Optional[int] = None,
+) -> int:
+    """
+    Archive completed tasks in throttled batches 🐉
+
+    Keeps going until there's nothing left to move (or `max_batches` is hit).
+    Returns the total number of tasks moved.
+    """
+    cutoff = datetime.now() - older_than
+    total = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        moved = await task_repository().archive_completed(cutoff, batch_size)
+        total += moved
+        batches += 1
+        if moved < batch_size:
+            break
+        await asyncio.sleep(pause)
+    return total
+
+
+async def run_archiver(interval: float = ARCHIVE_INTERVAL):
+    """Background loop: archive, then wait `interval` seconds, forever"""
+    while True:
+        try:
+            moved = await archive_completed_tasks()
+            if moved:
+                print(f"Archived {moved} completed tasks 🐉")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Never let a failed pass kill the loop - try again next interval
+            print(f"Task archiver failed: {e}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,287 @@
+"""
+Response Compression 🐉
+Content-negotiated gzip / brotli / zstd for JSON responses
+
+Task lists and exports are very compressible, so this ASGI middleware
+compresses responses when the client says it can handle it:
+
+- picks the best encoding the client accepts (zstd > br > gzip, honouring q=)
+- leaves small responses alone (below `minimum_size` bytes)
+- only touches compressible content types, and never double-encodes
+- works for streamed responses too: each chunk is compressed and flushed
+  as it goes, so clients still see data as soon as it's produced
+
+brotli and zstd need the optional `brotli` / `zstandard` packages; without
+them only gzip is offered. Settings (env vars): COMPRESSION_MIN_SIZE,
+COMPRESSION_GZIP_LEVEL, COMPRESSION_BROTLI_QUALITY, COMPRESSION_ZSTD_LEVEL.
+"""
+import os
+import zlib
+from typing import Dict, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+COMPRESSION_GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+COMPRESSION_BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+COMPRESSION_ZSTD_LEVEL = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+
+# Content types worth compressing (images etc. are already compressed)
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+
+
+class GzipEncoder:
+    """Streaming gzip via zlib (always available)"""
+    name = "gzip"
+
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliEncoder:
+    """Streaming brotli (needs the `brotli` package)"""
+    name = "br"
+
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdEncoder:
+    """Streaming zstd (needs the `zstandard` package)"""
+    name = "zstd"
+
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def available_encoders() -> Dict[str, type]:
+    """Encoders we can use here, best first"""
+    encoders = {}
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder
+    encoders["gzip"] = GzipEncoder
+    return encoders
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """'gzip;q=0.8, br' -> {'gzip': 0.8, 'br': 1.0}"""
+    accepted = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+    return accepted
+
+
+def choose_encoding(header: str, offered: List[str]) -> Optional[str]:
+    """Highest-q encoding the client accepts; ties go to our order in `offered`"""
+    accepted = parse_accept_encoding(header)
+    best, best_quality = None, 0.0
+    for name in offered:
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = name, quality
+    return best
+
+
+class CompressionStats:
+    """Bytes in/out per encoding, for the monitoring endpoint"""
+
+    def __init__(self):
+        self.responses: Dict[str, int] = {}
+        self.bytes_in: Dict[str, int] = {}
+        self.bytes_out: Dict[str, int] = {}
+        self.skipped_small = 0
+
+    def record(self, encoding: str, raw: int, compressed: int) -> None:
+        self.responses[encoding] = self.responses.get(encoding, 0) + 1
+        self.bytes_in[encoding] = self.bytes_in.get(encoding, 0) + raw
+        self.bytes_out[encoding] = self.bytes_out.get(encoding, 0) + compressed
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "skipped_small": self.skipped_small,
+            "encodings": {
+                name: {
+                    "responses": self.responses[name],
+                    "bytes_in": self.bytes_in[name],
+                    "bytes_out": self.bytes_out[name],
+                    "bytes_saved": self.bytes_in[name] - self.bytes_out[name],
+                }
+                for name in self.responses
+            },
+        }
+
+
+compression_stats = CompressionStats()
+
+
+class CompressionMiddleware:
+    """ASGI middleware that compresses responses per Accept-Encoding 🐉"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = COMPRESSION_MIN_SIZE,
+        levels: Optional[Dict[str, int]] = None,
+        encodings: Optional[List[str]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {
+            "gzip": COMPRESSION_GZIP_LEVEL,
+            "br": COMPRESSION_BROTLI_QUALITY,
+            "zstd": COMPRESSION_ZSTD_LEVEL,
+            **(levels or {}),
+        }
+        encoders = available_encoders()
+        self.encoders = {
+            name: cls for name, cls in encoders.items()
+            if encodings is None or name in encodings
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), list(self.encoders)
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(self, encoding, send)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Wraps `send` for one response and compresses the body on the way out"""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start_message: Optional[Message] = None
+        self.encoder = None
+        self.passthrough = False
+        self.raw_size = 0
+        self.compressed_size = 0
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers until we know whether we'll compress
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            # First body chunk: decide how this response goes out
+            start, self.start_message = self.start_message, None
+            if not self.passthrough and not more_body and len(body) < self.middleware.minimum_size:
+                if body:
+                    compression_stats.skipped_small += 1
+                self.passthrough = True
+            if self.passthrough:
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.encoder = self.middleware.encoders[self.encoding](self.middleware.levels[self.encoding])
+            if not more_body:
+                # Whole body in one go: compress it and send an exact Content-Length
+                data = self.encoder.compress(body) + self.encoder.finish()
+                await self.send(self._compressed_start(start, len(data)))
+                await self.send({"type": "http.response.body", "body": data})
+                compression_stats.record(self.encoding, len(body), len(data))
+                return
+            await self.send(self._compressed_start(start, None))
+        elif self.passthrough:
+            await self.send(message)
+            return
+
+        # Streaming: flush after every chunk so the client gets it right away
+        self.raw_size += len(body)
+        if more_body:
+            data = self.encoder.compress(body) + self.encoder.flush()
+        else:
+            data = self.encoder.compress(body) + self.encoder.finish()
+        self.compressed_size += len(data)
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        if not more_body:
+            compression_stats.record(self.encoding, self.raw_size, self.compressed_size)
+
+    def _compressed_start(self, start: Message, length: Optional[int]) -> Message:
+        """Response headers for the compressed body (no length when streaming)"""
+        headers = MutableHeaders(raw=list(start["headers"]))
+        headers["Content-Encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if length is not None:
+            headers["Content-Length"] = str(length)
+        elif "content-length" in headers:
+            del headers["content-length"]
+        return {**start, "headers": headers.raw}
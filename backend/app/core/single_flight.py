@@ -0,0 +1,71 @@
+"""
+Single-Flight Request Coalescing 🐉
+Concurrent reads for the same key share one in-flight database call
+
+When a shared task is opened on many clients at once, every request would
+otherwise run its own Task.get for the same id. With single-flight, the
+first request starts the call and everyone who asks for the same key while
+it is running awaits that same call - and gets its result or its error.
+
+Nothing is cached: once the call finishes, the next request starts fresh.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Deduplicates concurrent async calls by key"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+        # Counters for monitoring
+        self.calls = 0
+        self.executions = 0
+        self.deduplicated = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run `fn()` for `key`, or join the call already running for it"""
+        self.calls += 1
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        else:
+            self.deduplicated += 1
+
+        # shield() so one caller going away doesn't cancel the call for everyone
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        """Drop the finished call so the next request hits the database again"""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Snapshot of the counters for the monitoring endpoint"""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "deduplicated": self.deduplicated,
+            "in_flight": len(self._in_flight),
+        }
+
+
+# Shared groups for the read paths, registered so main.py can expose them
+_groups: Dict[str, SingleFlight] = {}
+
+
+def single_flight(name: str) -> SingleFlight:
+    """Get (or create) the named single-flight group"""
+    if name not in _groups:
+        _groups[name] = SingleFlight(name)
+    return _groups[name]
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Counters for every single-flight group"""
+    return {name: group.stats() for name, group in _groups.items()}
@@ -0,0 +1,106 @@
+"""
+Write Coalescing for Task Updates 🐉
+Merges bursts of PATCHes to the same task into a single database write
+
+When a user toggles `completed` or drags tasks around, update_task gets a
+burst of PATCHes for the same ids within milliseconds. With coalescing on,
+each patch is parked for a short window; patches for the same task are
+merged last-writer-wins per field, and every task touched in the window is
+flushed together as one bulk_write. Each caller gets the merged result.
+
+Enable with TASK_WRITE_COALESCE_MS=<window in milliseconds> (0 = off).
+It stays off by default: the payoff depends on MongoDB round-trip latency,
+so measure it first with `python -m benchmarks.bench_write_coalescing`
+against your database before turning it on.
+"""
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+from app.repositories import task_repository
+
+# Window in milliseconds; 0 keeps the plain read-modify-read path
+TASK_WRITE_COALESCE_MS = float(os.getenv("TASK_WRITE_COALESCE_MS", "0"))
+
+FlushFn = Callable[[Dict[Hashable, Dict[str, Any]]], Awaitable[Dict[Hashable, Any]]]
+
+
+class WriteCoalescer:
+    """
+    Buffers patches per key and flushes them together once per window.
+
+    `flush` receives {key: merged_patch} and returns {key: result}. Keys
+    missing from the result resolve to None (e.g. the task doesn't exist).
+    """
+
+    def __init__(self, flush: FlushFn, window: float):
+        self._flush = flush
+        self.window = window
+        self._pending: Dict[Hashable, Dict[str, Any]] = {}
+        self._waiters: Dict[Hashable, List[asyncio.Future]] = {}
+        self._timer: Optional[asyncio.Task] = None
+
+        # Counters for monitoring
+        self.submitted = 0
+        self.written = 0
+        self.flushes = 0
+
+    async def submit(self, key: Hashable, patch: Dict[str, Any]) -> Any:
+        """Queue a patch for `key` and wait for the flush that writes it"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        # Later patches win field by field
+        self._pending.setdefault(key, {}).update(patch)
+        self._waiters.setdefault(key, []).append(future)
+        self.submitted += 1
+
+        # The first patch of a window starts the flush timer
+        if self._timer is None:
+            self._timer = loop.create_task(self._flush_after_window())
+        return await future
+
+    async def _flush_after_window(self):
+        """Wait out the window, then write everything that piled up"""
+        await asyncio.sleep(self.window)
+        pending, waiters = self._pending, self._waiters
+        self._pending, self._waiters, self._timer = {}, {}, None
+
+        self.flushes += 1
+        self.written += len(pending)
+        try:
+            results = await self._flush(pending)
+        except Exception as e:
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for key, futures in waiters.items():
+            for future in futures:
+                # A caller may have gone away (cancelled) while we were writing
+                if not future.done():
+                    future.set_result(results.get(key))
+
+    def stats(self) -> Dict[str, float]:
+        """Snapshot of the counters for the monitoring endpoint"""
+        return {
+            "window_ms": self.window * 1000,
+            "submitted": self.submitted,
+            "written": self.written,
+            "flushes": self.flushes,
+            "coalesced": self.submitted - self.written,
+        }
+
+
+async def flush_task_updates(patches: Dict[Hashable, Dict[str, Any]]) -> Dict[Hashable, Any]:
+    """Apply merged patches with one bulk write, then read the tasks back"""
+    return await task_repository().bulk_update(patches)
+
+
+# Shared coalescer for update_task (None when the feature is off)
+task_write_coalescer: Optional[WriteCoalescer] = (
+    WriteCoalescer(flush_task_updates, TASK_WRITE_COALESCE_MS / 1000)
+    if TASK_WRITE_COALESCE_MS > 0 else None
+)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 from pathlib import Path
 from dotenv import load_dotenv
@@ -15,6 +16,9 @@ BACKEND_DIR = Path(__file__).resolve().parents[1] # .../TodoAppAZNext/backend
 load_dotenv(ROOT_DIR / ".env")
 load_dotenv(BACKEND_DIR / ".env", override=False)
 
+# Reads COMPRESSION_* settings on import, so it has to come after load_dotenv
+from .core.compression import CompressionMiddleware, compression_stats  # noqa: E402
+
 APP_ENV = os.getenv("APP_ENV", "dev")
 MONGO_URI = os.getenv("MONGO_URI")
 DB_NAME = {
@@ -23,7 +27,10 @@ DB_NAME = {
     "prod": os.getenv("MONGO_DB_NAME_PROD", "TodoAppAZNext"),
 }.get(APP_ENV, "TodoAppAZNext_dev")
 
-if not MONGO_URI:
+# APP_ENV=memory swaps MongoDB for the in-memory storage engine (tests, benchmarks)
+STORAGE_ENGINE = "memory" if APP_ENV == "memory" else "mongo"
+
+if STORAGE_ENGINE == "mongo" and not MONGO_URI:
     raise RuntimeError(
         "MONGO_URI not set. Put it in one of:\n"
         f" - {ROOT_DIR / '.env'}\n"
@@ -31,10 +38,16 @@ if not MONGO_URI:
         "Or start uvicorn with --env-file or set $env:MONGO_URI in the shell."
     )
 
+# Background archiving of old completed tasks (off by default in tests)
+ARCHIVE_ENABLED = os.getenv("ARCHIVE_ENABLED", "0" if APP_ENV in ("test", "memory") else "1") == "1"
+
 if APP_ENV == "prod" and os.getenv("ALLOW_PROD") != "1":
     raise RuntimeError("Refusing to start in prod without ALLOW_PROD=1")
 
-print(f"Connected to DB: {DB_NAME} (env={APP_ENV})")
+if STORAGE_ENGINE == "memory":
+    print(f"Using in-memory storage, nothing is persisted (env={APP_ENV})")
+else:
+    print(f"Connected to DB: {DB_NAME} (env={APP_ENV})")
 
 # Global variables for health checks
 client = None
@@ -45,9 +58,17 @@ database = None
 async def lifespan(app: FastAPI):
     """FastAPI lifespan context manager for startup/shutdown"""
     # Startup
-    await init_database()
+    if STORAGE_ENGINE == "mongo":
+        await init_database()
+    configure_storage(STORAGE_ENGINE)
+    archiver = None
+    if ARCHIVE_ENABLED:
+        from .core.archiver import run_archiver
+        archiver = asyncio.create_task(run_archiver())
     yield
     # Shutdown (cleanup if needed)
+    if archiver:
+        archiver.cancel()
     global client
     if client:
         client.close()
@@ -68,6 +89,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# gzip/brotli/zstd per Accept-Encoding (see app/core/compression.py for settings)
+app.add_middleware(CompressionMiddleware)
+
 async def init_database():
     """Initialize the database connection and Beanie ODM"""
     global client, database
@@ -75,11 +99,11 @@ async def init_database():
     database = client[DB_NAME]
     
     # Import document models
-    from .models.task import Task
+    from .models.task import Task, ArchivedTask
     from .models.user import User
     
     # Initialize Beanie with our document models
-    await init_beanie(database=database, document_models=[Task, User])
+    await init_beanie(database=database, document_models=[Task, ArchivedTask, User])
     print(f"Database initialized with Beanie ODM! Environment: {APP_ENV}, Database: {DB_NAME}")
 
 # Startup is now handled by lifespan context manager above
@@ -88,6 +112,10 @@ async def init_database():
 from .routes.tasks_routes import router as tasks_router  # noqa: E402
 from .routes.auth import router as auth_router  # noqa: E402
 # from .routes.labels import router as labels_router  # noqa: E402
+from .repositories import configure_storage  # noqa: E402
+from .core.admission import admission_stats  # noqa: E402
+from .core.single_flight import single_flight_stats  # noqa: E402
+from .core.write_coalescer import task_write_coalescer  # noqa: E402
 
 app.include_router(tasks_router, prefix="/tasks", tags=["tasks"])
 app.include_router(auth_router, prefix="/auth", tags=["auth"])
@@ -98,9 +126,22 @@ app.include_router(auth_router, prefix="/auth", tags=["auth"])
 async def health_check():
     return {"status": "healthy", "message": "API is running smoothly!"}
 
+@app.get("/metrics")
+async def metrics():
+    """Counters for monitoring (admission control, single-flight, write coalescing, compression) 🐉"""
+    return {
+        "admission": admission_stats(),
+        "single_flight": single_flight_stats(),
+        "write_coalescing": task_write_coalescer.stats() if task_write_coalescer else None,
+        "compression": compression_stats.snapshot(),
+    }
+
 @app.get("/db-test")
 async def db_test():
     """Test database connection"""
+    if STORAGE_ENGINE == "memory":
+        return {"status": "success", "environment": APP_ENV, "database": "memory", "collections": []}
+    
     if client is None or database is None:
         return {"status": "error", "message": "Database not initialized"}
     
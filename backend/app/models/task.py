@@ -60,6 +60,26 @@ class Task(Document):
             [("user_id", 1), ("completed", 1)],  # Compound index for filtering
             [("user_id", 1), ("deadline", 1)],   # Compound index for deadline sorting
             "label_ids",  # Multikey index for label filtering
+            [("completed", 1), ("updated_at", 1)],  # Archiver: old completed tasks
+        ]
+
+class ArchivedTask(Task):
+    """
+    Completed task moved out of the hot `tasks` collection 🐉
+
+    Same shape as Task, plus when it was archived. Lives in its own
+    collection so the hot indexes only cover tasks people still read.
+    """
+    archived_at: Optional[datetime] = Field(None, description="When the task was archived")
+
+    class Settings:
+        """Beanie document settings 🐉"""
+        name = "tasks_archive"  # MongoDB collection name
+
+        # Archive reads are rare, so keep just the user lookups
+        indexes = [
+            "user_id",
+            [("user_id", 1), ("deadline", 1)],
         ]
 
 # Input schemas for API endpoints (still Pydantic BaseModel, not Document)
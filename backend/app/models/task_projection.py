@@ -0,0 +1,90 @@
+"""
+Task Field Projections 🐉
+Sparse fieldsets for task reads (?fields=title,priority,deadline,completed)
+
+A list view rarely needs every field, and `description` can be large. The
+requested fields are validated against the Task schema and turned into a
+slim Pydantic model. Beanie uses that model as the MongoDB projection, so
+the skipped fields never leave the database, and the same model is what we
+serialize back to the client.
+
+`_id` is always returned. `created_at` is always fetched (it's how mixed
+hot/archive results are ordered) but only returned when asked for.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Sequence, Type
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, create_model
+
+from app.models.task import Task
+
+# Fields a client may ask for (internal Beanie fields left out)
+TASK_FIELDS = tuple(name for name in Task.model_fields if name not in ("id", "revision_id"))
+
+
+def parse_task_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Turn "title,priority" into a set of Task field names.
+
+    Returns None when no projection was asked for; raises ValueError for
+    unknown fields or an empty list ("?fields=" or "?fields=,").
+    """
+    if fields is None:
+        return None
+    requested = frozenset(name.strip() for name in fields.split(",") if name.strip())
+    if not requested:
+        raise ValueError(f"fields must name at least one task field. Allowed: {', '.join(TASK_FIELDS)}")
+    requested -= {"id", "_id"}  # always included anyway
+    unknown = requested - set(TASK_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown task field(s): {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(TASK_FIELDS)}"
+        )
+    return requested
+
+
+# What a ?fields= response looks like, for the OpenAPI docs: `_id` plus
+# whichever task fields were requested (the rest are left out entirely)
+PartialTask = create_model(
+    "PartialTask",
+    __config__=ConfigDict(populate_by_name=True),
+    __doc__="A task with only the fields requested via ?fields= (plus _id) 🐉",
+    id=(PydanticObjectId, Field(..., alias="_id")),
+    **{name: (Optional[Task.model_fields[name].annotation], None) for name in TASK_FIELDS},
+)
+
+
+@lru_cache(maxsize=256)
+def task_projection(fields: FrozenSet[str]) -> Type[BaseModel]:
+    """Slim Task model with just `fields` (cached per field set)"""
+    definitions = {"id": (PydanticObjectId, Field(..., alias="_id"))}
+    for name in TASK_FIELDS:
+        if name in fields:
+            field = Task.model_fields[name]
+            definitions[name] = (field.annotation, field)
+    if "created_at" not in fields:
+        definitions["created_at"] = (datetime, Field(..., exclude=True))
+
+    return create_model(
+        "TaskProjection",
+        __config__=ConfigDict(populate_by_name=True),
+        **definitions,
+    )
+
+
+@lru_cache(maxsize=256)
+def _list_adapter(projection: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[projection])
+
+
+def dump_tasks_json(projection: Type[BaseModel], tasks: Sequence[BaseModel]) -> bytes:
+    """Serialize projected tasks straight to JSON bytes (same shape as Task output)"""
+    return _list_adapter(projection).dump_json(list(tasks), by_alias=True)
+
+
+def dump_task_json(task: BaseModel) -> bytes:
+    """Serialize one projected task to JSON bytes"""
+    return task.model_dump_json(by_alias=True)
@@ -0,0 +1,184 @@
+"""
+Compact Task Record 🐉
+A small, immutable stand-in for Task when lots of tasks sit in memory
+
+A Beanie Task Document carries Pydantic machinery, revision/state tracking
+and a per-instance __dict__, so each one costs kilobytes. TaskRecord is a
+plain NamedTuple (no __dict__, immutable) that stores:
+
+- id as the 12 raw ObjectId bytes instead of an ObjectId object
+- priority as the shared PriorityLevel enum member (one object per level)
+- deadline as a date ordinal (int)
+- created_at / updated_at as integer microseconds since the epoch
+- user_id / label ids interned, since the same ids repeat across tasks
+
+Use it for server-side caches; convert back with to_document() when you
+need to write through Beanie.
+"""
+import sys
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+
+from app.models.task import Task, PriorityLevel
+
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_micros(value: datetime) -> int:
+    """datetime -> microseconds since the epoch (aware values are stored as UTC)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH) // MICROSECOND
+
+
+def _from_micros(value: int) -> datetime:
+    """Microseconds since the epoch -> naive datetime"""
+    return EPOCH + timedelta(microseconds=value)
+
+
+def _to_ordinal(value: Any) -> int:
+    """Deadline -> date ordinal (Mongo hands dates back as midnight datetimes)"""
+    if isinstance(value, datetime):
+        value = value.date()
+    elif isinstance(value, str):
+        value = date.fromisoformat(value)
+    return value.toordinal()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Share one string object for ids that repeat across many tasks"""
+    return sys.intern(value) if value is not None else None
+
+
+class TaskRecord(NamedTuple):
+    """Immutable, tuple-backed task for caches 🐉"""
+    id: bytes
+    title: str
+    description: Optional[str]
+    priority: PriorityLevel
+    deadline: int
+    completed: bool
+    label_ids: Tuple[str, ...]
+    user_id: Optional[str]
+    created_at: int
+    updated_at: int
+
+    # Friendly accessors for the compact fields
+
+    @property
+    def object_id(self) -> ObjectId:
+        return ObjectId(self.id)
+
+    @property
+    def deadline_date(self) -> date:
+        return date.fromordinal(self.deadline)
+
+    @property
+    def created_at_datetime(self) -> datetime:
+        return _from_micros(self.created_at)
+
+    @property
+    def updated_at_datetime(self) -> datetime:
+        return _from_micros(self.updated_at)
+
+    # Beanie Document
+
+    @classmethod
+    def from_document(cls, task: Task) -> "TaskRecord":
+        """Build a record from a Task document"""
+        return cls(
+            id=task.id.binary,
+            title=task.title,
+            description=task.description,
+            priority=PriorityLevel(task.priority),
+            deadline=_to_ordinal(task.deadline),
+            completed=bool(task.completed),
+            label_ids=tuple(_intern(label_id) for label_id in task.label_ids),
+            user_id=_intern(task.user_id),
+            created_at=_to_micros(task.created_at),
+            updated_at=_to_micros(task.updated_at),
+        )
+
+    def to_document(self) -> Task:
+        """Rebuild a full Task document (needs Beanie to be initialized)"""
+        return Task(
+            id=self.object_id,
+            title=self.title,
+            description=self.description,
+            priority=self.priority,
+            deadline=self.deadline_date,
+            completed=self.completed,
+            label_ids=list(self.label_ids),
+            user_id=self.user_id,
+            created_at=self.created_at_datetime,
+            updated_at=self.updated_at_datetime,
+        )
+
+    # Raw MongoDB documents (what motor returns / accepts)
+
+    @classmethod
+    def from_bson(cls, doc: Dict[str, Any]) -> "TaskRecord":
+        """Build a record straight from a raw `tasks` document, skipping Pydantic"""
+        return cls(
+            id=doc["_id"].binary,
+            title=doc["title"],
+            description=doc.get("description"),
+            priority=PriorityLevel(doc["priority"]),
+            deadline=_to_ordinal(doc["deadline"]),
+            completed=bool(doc.get("completed", False)),
+            label_ids=tuple(_intern(label_id) for label_id in doc.get("label_ids") or ()),
+            user_id=_intern(doc.get("user_id")),
+            created_at=_to_micros(doc["created_at"]),
+            updated_at=_to_micros(doc["updated_at"]),
+        )
+
+    def to_bson(self) -> Dict[str, Any]:
+        """Raw document in the same shape Beanie stores in `tasks`"""
+        return {
+            "_id": self.object_id,
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "deadline": datetime.combine(self.deadline_date, datetime.min.time()),
+            "completed": self.completed,
+            "label_ids": list(self.label_ids),
+            "user_id": self.user_id,
+            "created_at": self.created_at_datetime,
+            "updated_at": self.updated_at_datetime,
+        }
+
+    # JSON (same shape the API returns for a Task)
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "TaskRecord":
+        """Build a record from an API-shaped JSON dict"""
+        return cls(
+            id=ObjectId(data["_id"]).binary,
+            title=data["title"],
+            description=data.get("description"),
+            priority=PriorityLevel(data["priority"]),
+            deadline=_to_ordinal(data["deadline"]),
+            completed=bool(data.get("completed", False)),
+            label_ids=tuple(_intern(label_id) for label_id in data.get("label_ids") or ()),
+            user_id=_intern(data.get("user_id")),
+            created_at=_to_micros(datetime.fromisoformat(data["created_at"])),
+            updated_at=_to_micros(datetime.fromisoformat(data["updated_at"])),
+        )
+
+    def to_json(self) -> Dict[str, Any]:
+        """API-shaped JSON dict, without going through Pydantic"""
+        return {
+            "_id": self.id.hex(),
+            "title": self.title,
+            "description": self.description,
+            "priority": self.priority.value,
+            "deadline": self.deadline_date.isoformat(),
+            "completed": self.completed,
+            "label_ids": list(self.label_ids),
+            "user_id": self.user_id,
+            "created_at": self.created_at_datetime.isoformat(),
+            "updated_at": self.updated_at_datetime.isoformat(),
+        }
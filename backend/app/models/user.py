@@ -26,7 +26,7 @@ class User(Document):
         """Beanie document settings 🐉"""
         name = "users"  # MongoDB collection name
         
-        # Indexes for performance and uniqueness
-        indexes = [
-            "email",  # Unique index on email (handled by Indexed type above)
-        ]
+        # The unique email index comes from the Indexed type above. Don't list
+        # "email" here too: Beanie lets Settings.indexes replace an Indexed()
+        # index on the same key, which would silently drop unique=True.
+        indexes = []
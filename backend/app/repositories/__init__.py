@@ -0,0 +1,49 @@
+# Storage engine selection 🐉
+#
+# configure_storage("mongo")  -> Beanie/MongoDB (needs init_beanie first)
+# configure_storage("memory") -> fresh in-memory store (APP_ENV=memory)
+#
+# Routes grab the active repositories with task_repository() / user_repository().
+
+from typing import Optional
+
+from .base import TaskRepository, UserRepository
+
+_tasks: Optional[TaskRepository] = None
+_users: Optional[UserRepository] = None
+
+
+def configure_storage(engine: str) -> None:
+    """Switch every repository to the given storage engine"""
+    global _tasks, _users
+    if engine == "memory":
+        from .memory import MemoryTaskRepository, MemoryUserRepository
+        _tasks, _users = MemoryTaskRepository(), MemoryUserRepository()
+    elif engine == "mongo":
+        from .mongo import MongoTaskRepository, MongoUserRepository
+        _tasks, _users = MongoTaskRepository(), MongoUserRepository()
+    else:
+        raise ValueError(f"Unknown storage engine: {engine}")
+
+
+def task_repository() -> TaskRepository:
+    """The active task repository"""
+    if _tasks is None:
+        raise RuntimeError("Storage not configured - call configure_storage() first")
+    return _tasks
+
+
+def user_repository() -> UserRepository:
+    """The active user repository"""
+    if _users is None:
+        raise RuntimeError("Storage not configured - call configure_storage() first")
+    return _users
+
+
+__all__ = [
+    "TaskRepository",
+    "UserRepository",
+    "configure_storage",
+    "task_repository",
+    "user_repository",
+]
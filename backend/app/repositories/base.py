@@ -0,0 +1,94 @@
+"""
+Repository Interfaces 🐉
+What the routes need from storage, independent of the engine behind it
+
+Routes talk to a TaskRepository / UserRepository instead of calling Beanie
+directly, so the same code runs on MongoDB (mongo.py) or fully in memory
+(memory.py). Both engines hand back regular Task / User documents.
+The interfaces are abstract, so an engine that misses a method fails as
+soon as it's created rather than with a 500 at request time.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel
+
+from app.models.task import Task
+from app.models.user import User
+
+
+def newest_first(hot: List[BaseModel], archived: List[BaseModel], limit: int) -> List[BaseModel]:
+    """Merge two newest-first lists and keep the newest `limit` overall"""
+    return sorted(hot + archived, key=lambda t: t.created_at, reverse=True)[:limit]
+
+
+class TaskRepository(ABC):
+    """Storage operations for tasks (hot collection + archive)"""
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> Task:
+        """Insert a new task built from validated request data"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def list(
+        self,
+        limit: int,
+        include_archived: bool = False,
+        user_id: Optional[str] = None,
+        completed: Optional[bool] = None,
+        projection: Optional[Type[BaseModel]] = None,
+    ) -> List[Task]:
+        """
+        Newest tasks first, optionally filtered and including the archive.
+
+        With a `projection` model, only its fields are loaded and instances
+        of that model are returned instead of full Tasks.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get(
+        self,
+        task_id: PydanticObjectId,
+        archived: bool = False,
+        projection: Optional[Type[BaseModel]] = None,
+    ) -> Optional[Task]:
+        """One task by id from the hot collection (or the archive if archived=True)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def update(self, task_id: PydanticObjectId, patch: Dict[str, Any]) -> Optional[Task]:
+        """$set the patch on one task and return the updated task (None if missing)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def bulk_update(self, patches: Dict[PydanticObjectId, Dict[str, Any]]) -> Dict[PydanticObjectId, Task]:
+        """Apply many patches in one write, returning the updated tasks that exist"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete(self, task_id: PydanticObjectId) -> bool:
+        """Delete one task from the hot collection or the archive, returning False if it didn't exist"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def archive_completed(self, cutoff: datetime, batch_size: int) -> int:
+        """Move up to `batch_size` completed tasks not updated since `cutoff` to the archive"""
+        raise NotImplementedError
+
+
+class UserRepository(ABC):
+    """Storage operations for users"""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Find a user by (unique) email"""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def create(self, data: Dict[str, Any]) -> User:
+        """Insert a new user (raises DuplicateKeyError if the email is taken)"""
+        raise NotImplementedError
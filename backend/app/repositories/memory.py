@@ -0,0 +1,262 @@
+"""
+In-Memory Storage Engine 🐉
+Dict-backed repositories for fast tests and benchmarks (APP_ENV=memory)
+
+Documents live in a dict keyed by id. Secondary indexes are sorted lists
+of (key, id) entries built from Task.Settings.indexes, so lookups behave
+like the Mongo indexes they mirror: the index whose leading fields match
+the most filters is used, and list fields (label_ids) are multikey.
+There's also a created_at index for the default newest-first listing.
+
+Documents are built with model_construct() because Beanie isn't initialized
+in this mode; inputs are already validated by the request schemas. Stored
+documents are never mutated - updates swap in a fresh copy - so it's safe
+to hand them straight back to callers.
+"""
+import itertools
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from beanie import PydanticObjectId
+from pydantic import BaseModel
+from pymongo.errors import DuplicateKeyError
+
+from app.models.task import Task, ArchivedTask
+from app.models.user import User
+from app.repositories.base import TaskRepository, UserRepository, newest_first
+
+
+def _sortable(value: Any) -> Tuple[bool, Any]:
+    """Index key part that sorts None before everything else (like Mongo's null)"""
+    return (value is not None, value)
+
+
+def index_fields(spec: Any) -> List[str]:
+    """Field names from a Beanie index spec: "field" or [("field", 1), ...]"""
+    if isinstance(spec, str):
+        return [spec]
+    return [field for field, _direction in spec]
+
+
+class SortedIndex:
+    """A sorted list of (key, id) entries over one or more fields"""
+
+    def __init__(self, fields: List[str]):
+        self.fields = fields
+        self.entries: List[Tuple[tuple, PydanticObjectId]] = []
+
+    def keys_for(self, doc: Any) -> Iterable[tuple]:
+        """Every key this document has in the index (more than one for list fields)"""
+        parts = []
+        for field in self.fields:
+            value = getattr(doc, field)
+            values = value if isinstance(value, list) else [value]
+            parts.append([_sortable(v) for v in values])
+        return itertools.product(*parts)
+
+    def add(self, doc: Any) -> None:
+        for key in self.keys_for(doc):
+            insort(self.entries, (key, doc.id))
+
+    def remove(self, doc: Any) -> None:
+        for key in self.keys_for(doc):
+            entry = (key, doc.id)
+            position = bisect_left(self.entries, entry)
+            if position < len(self.entries) and self.entries[position] == entry:
+                del self.entries[position]
+
+    def lookup(self, *values: Any) -> List[PydanticObjectId]:
+        """Ids whose leading index fields equal `values` (a prefix of self.fields)"""
+        prefix = tuple(_sortable(v) for v in values)
+        size = len(prefix)
+        low = bisect_left(self.entries, prefix, key=lambda entry: entry[0][:size])
+        high = bisect_right(self.entries, prefix, key=lambda entry: entry[0][:size])
+        return [doc_id for _key, doc_id in self.entries[low:high]]
+
+    def lookup_below(self, *values: Any, below: Any) -> List[PydanticObjectId]:
+        """
+        Ids whose leading fields equal `values` and whose next field is < `below`,
+        lowest first. Like Mongo's $lt, entries where that field is None don't match.
+        """
+        prefix = tuple(_sortable(v) for v in values)
+        size = len(prefix) + 1
+        low = bisect_right(self.entries, prefix + (_sortable(None),), key=lambda entry: entry[0][:size])
+        high = bisect_left(self.entries, prefix + (_sortable(below),), key=lambda entry: entry[0][:size])
+        return [doc_id for _key, doc_id in self.entries[low:high]]
+
+    def ids_descending(self) -> Iterable[PydanticObjectId]:
+        """All ids from the highest key down"""
+        return (doc_id for _key, doc_id in reversed(self.entries))
+
+
+class TaskStore:
+    """One in-memory collection of tasks with its indexes"""
+
+    def __init__(self, index_specs: List[Any]):
+        self.docs: Dict[PydanticObjectId, Task] = {}
+        self.indexes = [SortedIndex(index_fields(spec)) for spec in index_specs]
+        self.by_created_at = SortedIndex(["created_at"])
+
+    def put(self, doc: Task) -> None:
+        old = self.docs.get(doc.id)
+        if old is not None:
+            self.drop(old.id)
+        self.docs[doc.id] = doc
+        for index in self.indexes + [self.by_created_at]:
+            index.add(doc)
+
+    def drop(self, doc_id: PydanticObjectId) -> Optional[Task]:
+        doc = self.docs.pop(doc_id, None)
+        if doc is not None:
+            for index in self.indexes + [self.by_created_at]:
+                index.remove(doc)
+        return doc
+
+    def index_on(self, fields: List[str]) -> SortedIndex:
+        """The index over exactly these fields (from Settings.indexes)"""
+        return next(index for index in self.indexes if index.fields == fields)
+
+    def find(self, filters: Dict[str, Any], limit: int) -> List[Task]:
+        """Newest-first tasks matching equality filters, using the best index"""
+        # Pick the index whose leading fields cover the most filters
+        best, used = None, 0
+        for index in self.indexes:
+            covered = 0
+            for field in index.fields:
+                if field not in filters:
+                    break
+                covered += 1
+            if covered > used:
+                best, used = index, covered
+
+        if best is None:
+            # No usable index: walk created_at newest first and stop at `limit`
+            candidates = (self.docs[doc_id] for doc_id in self.by_created_at.ids_descending())
+            matches = (doc for doc in candidates if _matches(doc, filters))
+            return list(itertools.islice(matches, limit))
+
+        ids = best.lookup(*(filters[field] for field in best.fields[:used]))
+        matches = [self.docs[doc_id] for doc_id in dict.fromkeys(ids)]
+        matches = [doc for doc in matches if _matches(doc, filters)]
+        matches.sort(key=lambda doc: (doc.created_at, doc.id), reverse=True)
+        return matches[:limit]
+
+
+def _matches(doc: Task, filters: Dict[str, Any]) -> bool:
+    """Mongo-style equality: list fields match if they contain the value"""
+    for field, expected in filters.items():
+        value = getattr(doc, field)
+        if isinstance(value, list) and not isinstance(expected, list):
+            if expected not in value:
+                return False
+        elif value != expected:
+            return False
+    return True
+
+
+def _fields(doc: Task) -> Dict[str, Any]:
+    """Field values of a task, ready to build another task from"""
+    return {name: getattr(doc, name) for name in Task.model_fields}
+
+
+def _project(doc: Optional[Task], projection: Optional[Type[BaseModel]]) -> Optional[BaseModel]:
+    """Copy just the projection's fields out of a stored task"""
+    if doc is None or projection is None:
+        return doc
+    return projection.model_construct(**{name: getattr(doc, name) for name in projection.model_fields})
+
+
+class MemoryTaskRepository(TaskRepository):
+    """Tasks held in memory, with indexes mirroring Task.Settings.indexes"""
+
+    def __init__(self):
+        self.tasks = TaskStore(Task.Settings.indexes)
+        self.archive = TaskStore(ArchivedTask.Settings.indexes)
+
+    async def create(self, data: Dict[str, Any]) -> Task:
+        task = Task.model_construct(id=PydanticObjectId(), **data)
+        self.tasks.put(task)
+        return task
+
+    async def list(
+        self,
+        limit: int,
+        include_archived: bool = False,
+        user_id: Optional[str] = None,
+        completed: Optional[bool] = None,
+        projection: Optional[Type[BaseModel]] = None,
+    ) -> List[Task]:
+        filters = {}
+        if user_id is not None:
+            filters["user_id"] = user_id
+        if completed is not None:
+            filters["completed"] = completed
+
+        tasks = self.tasks.find(filters, limit)
+        if include_archived:
+            tasks = newest_first(tasks, self.archive.find(filters, limit), limit)
+        return [_project(task, projection) for task in tasks]
+
+    async def get(
+        self,
+        task_id: PydanticObjectId,
+        archived: bool = False,
+        projection: Optional[Type[BaseModel]] = None,
+    ) -> Optional[Task]:
+        return _project((self.archive if archived else self.tasks).docs.get(task_id), projection)
+
+    async def update(self, task_id: PydanticObjectId, patch: Dict[str, Any]) -> Optional[Task]:
+        task = self.tasks.docs.get(task_id)
+        if task is None:
+            return None
+        updated = task.model_copy(update=patch)
+        self.tasks.put(updated)
+        return updated
+
+    async def bulk_update(self, patches: Dict[PydanticObjectId, Dict[str, Any]]) -> Dict[PydanticObjectId, Task]:
+        results = {}
+        for task_id, patch in patches.items():
+            updated = await self.update(task_id, patch)
+            if updated is not None:
+                results[task_id] = updated
+        return results
+
+    async def delete(self, task_id: PydanticObjectId) -> bool:
+        # Archived tasks are still readable, so they must be deletable too
+        dropped = [store.drop(task_id) for store in (self.tasks, self.archive)]
+        return any(doc is not None for doc in dropped)
+
+    async def archive_completed(self, cutoff: datetime, batch_size: int) -> int:
+        # Same access path as Mongo: the (completed, updated_at) index, oldest first
+        index = self.tasks.index_on(["completed", "updated_at"])
+        ids = index.lookup_below(True, below=cutoff)[:batch_size]
+        old = [self.tasks.docs[doc_id] for doc_id in ids]
+
+        # Same outcome as the Mongo engine: put() replaces any stale archive copy,
+        # and nothing can edit the task between picking it and dropping it here
+        archived_at = datetime.now()
+        for task in old:
+            self.archive.put(ArchivedTask.model_construct(**_fields(task), archived_at=archived_at))
+            self.tasks.drop(task.id)
+        return len(old)
+
+
+class MemoryUserRepository(UserRepository):
+    """Users held in memory, with a unique email index"""
+
+    def __init__(self):
+        self.users: Dict[PydanticObjectId, User] = {}
+        self.by_email: Dict[str, PydanticObjectId] = {}
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        user_id = self.by_email.get(email)
+        return self.users.get(user_id) if user_id is not None else None
+
+    async def create(self, data: Dict[str, Any]) -> User:
+        if data["email"] in self.by_email:
+            raise DuplicateKeyError(f"E11000 duplicate key error: email {data['email']}")
+        user = User.model_construct(id=PydanticObjectId(), **data)
+        self.users[user.id] = user
+        self.by_email[user.email] = user.id
+        return user
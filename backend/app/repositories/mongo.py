@@ -0,0 +1,139 @@
+"""
+MongoDB Storage Engine 🐉
+The repositories backed by Beanie ODM (the app's normal mode)
+"""
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type
+
+from beanie import BulkWriter, PydanticObjectId
+from beanie.operators import In
+from pydantic import BaseModel
+from pymongo import ReplaceOne
+
+from app.models.task import Task, ArchivedTask
+from app.models.user import User
+from app.repositories.base import TaskRepository, UserRepository, newest_first
+
+
+class MongoTaskRepository(TaskRepository):
+    """Tasks stored in the `tasks` / `tasks_archive` collections"""
+
+    async def create(self, data: Dict[str, Any]) -> Task:
+        task = Task(**data)
+        await task.create()
+        return task
+
+    async def list(
+        self,
+        limit: int,
+        include_archived: bool = False,
+        user_id: Optional[str] = None,
+        completed: Optional[bool] = None,
+        projection: Optional[Type[BaseModel]] = None,
+    ) -> List[Task]:
+        filters = {}
+        if user_id is not None:
+            filters["user_id"] = user_id
+        if completed is not None:
+            filters["completed"] = completed
+
+        # Beanie makes queries super clean!
+        query = Task.find(filters).sort(-Task.created_at).limit(limit)
+        tasks = await (query.project(projection) if projection else query).to_list()
+        if include_archived:
+            # Newest `limit` from each side, then merge and keep the newest overall
+            query = ArchivedTask.find(filters).sort(-ArchivedTask.created_at).limit(limit)
+            archived = await (query.project(projection) if projection else query).to_list()
+            tasks = newest_first(tasks, archived, limit)
+        return tasks
+
+    async def get(
+        self,
+        task_id: PydanticObjectId,
+        archived: bool = False,
+        projection: Optional[Type[BaseModel]] = None,
+    ) -> Optional[Task]:
+        document = ArchivedTask if archived else Task
+        if projection:
+            # Let MongoDB drop the unwanted fields before they hit the wire
+            return await document.find_one(document.id == task_id).project(projection)
+        return await document.get(task_id)
+
+    async def update(self, task_id: PydanticObjectId, patch: Dict[str, Any]) -> Optional[Task]:
+        task = await Task.get(task_id)
+        if not task:
+            return None
+        await task.update({"$set": patch})
+        return await Task.get(task_id)
+
+    async def bulk_update(self, patches: Dict[PydanticObjectId, Dict[str, Any]]) -> Dict[PydanticObjectId, Task]:
+        # One bulk_write for every patch, then read the tasks back in one query
+        async with BulkWriter() as bulk_writer:
+            for task_id, patch in patches.items():
+                await Task.find_one(Task.id == task_id).update(
+                    {"$set": patch}, bulk_writer=bulk_writer
+                )
+
+        tasks = await Task.find(In(Task.id, list(patches))).to_list()
+        return {task.id: task for task in tasks}
+
+    async def delete(self, task_id: PydanticObjectId) -> bool:
+        # Archived tasks are still readable, so they must be deletable too
+        deleted = False
+        for document in (Task, ArchivedTask):
+            task = await document.get(task_id)
+            if task:
+                await task.delete()
+                deleted = True
+        return deleted
+
+    async def archive_completed(self, cutoff: datetime, batch_size: int) -> int:
+        hot = Task.get_motor_collection()
+        archive = ArchivedTask.get_motor_collection()
+
+        # Oldest first, straight off the (completed, updated_at) index
+        docs = await hot.find(
+            {"completed": True, "updated_at": {"$lt": cutoff}}
+        ).sort("updated_at", 1).limit(batch_size).to_list(length=batch_size)
+        if not docs:
+            return 0
+
+        archived_at = datetime.now()
+        for doc in docs:
+            doc["archived_at"] = archived_at
+
+        # Upsert so a stale archive copy (left by an earlier, interrupted move)
+        # is overwritten with what we just read
+        await archive.bulk_write(
+            [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs],
+            ordered=False,
+        )
+
+        # Only delete a hot task if it's still exactly the version we copied -
+        # a PATCH that landed since the find() bumps updated_at and keeps it hot.
+        # One delete per task, so we know exactly which ones matched.
+        results = await asyncio.gather(*[
+            hot.delete_one({"_id": doc["_id"], "completed": True, "updated_at": doc["updated_at"]})
+            for doc in docs
+        ])
+
+        # Any delete that missed means the task changed (edited, or deleted by
+        # its owner) mid-move: drop our fresh copy so the archive doesn't keep
+        # a stale version or bring a deleted task back
+        missed = [doc["_id"] for doc, result in zip(docs, results) if result.deleted_count == 0]
+        if missed:
+            await archive.delete_many({"_id": {"$in": missed}, "archived_at": archived_at})
+        return len(docs) - len(missed)
+
+
+class MongoUserRepository(UserRepository):
+    """Users stored in the `users` collection"""
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await User.find_one(User.email == email)
+
+    async def create(self, data: Dict[str, Any]) -> User:
+        user = User(**data)
+        await user.create()
+        return user
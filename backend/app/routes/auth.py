@@ -2,14 +2,27 @@
 Authentication Routes 🐉
 Handles user signup, login, and authentication
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from passlib.context import CryptContext
+from pymongo.errors import DuplicateKeyError
 from datetime import datetime, UTC
 
-from app.models.user import User
+from app.core.admission import AdmissionController, register
+from app.core.single_flight import single_flight
+from app.repositories import user_repository
 from app.schemas.auth_schema import SignupIn, LoginIn, UserOut
 
-router = APIRouter(tags=["auth"])
+# Bcrypt is CPU heavy, so auth gets a much tighter budget than tasks
+# (override with ADMISSION_AUTH_* env vars)
+admission = register(AdmissionController.from_env(
+    "auth", max_concurrency=4, max_queue_time=1.0, rate=5, burst=20,
+))
+
+router = APIRouter(tags=["auth"], dependencies=[Depends(admission)])
+
+# Concurrent lookups for the same email share one database read
+user_lookups = single_flight("user_by_email")
 
 # Password hashing configuration
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,6 +35,11 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash 🐉"""
     return pwd_context.verify(plain_password, hashed_password)
 
+async def find_user_by_email(email: str):
+    """Find a user by email, deduplicating concurrent lookups 🐉"""
+    users = user_repository()
+    return await user_lookups.do(email, lambda: users.get_by_email(email))
+
 @router.post("/signup", response_model=UserOut, status_code=201)
 async def signup(signup_data: SignupIn):
     """
@@ -33,7 +51,7 @@ async def signup(signup_data: SignupIn):
     Returns 409 if email already exists.
     """
     # Check if email already exists
-    existing_user = await User.find_one(User.email == signup_data.email)
+    existing_user = await find_user_by_email(signup_data.email)
     if existing_user:
         raise HTTPException(
             status_code=409,
@@ -41,17 +59,22 @@ async def signup(signup_data: SignupIn):
         )
     
     # Hash the password securely
-    password_hash = hash_password(signup_data.password)
-    
-    # Create new user
-    user = User(
-        email=signup_data.email,
-        password_hash=password_hash,
-        created_at=datetime.now(UTC)
-    )
+    # (run in a worker thread so bcrypt doesn't block the event loop)
+    password_hash = await run_in_threadpool(hash_password, signup_data.password)
     
-    # Save to database
-    await user.create()
+    # Create new user and save to database
+    # (two signups racing past the check above hit the unique email index)
+    try:
+        user = await user_repository().create({
+            "email": signup_data.email,
+            "password_hash": password_hash,
+            "created_at": datetime.now(UTC),
+        })
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=409,
+            detail="email already registered"
+        )
     
     # Return user data (excluding password_hash)
     return UserOut(
@@ -71,7 +94,7 @@ async def login(login_data: LoginIn):
     Returns 401 if credentials are invalid.
     """
     # Find user by email
-    user = await User.find_one(User.email == login_data.email)
+    user = await find_user_by_email(login_data.email)
     if not user:
         raise HTTPException(
             status_code=401,
@@ -79,7 +102,7 @@ async def login(login_data: LoginIn):
         )
     
     # Verify password
-    if not verify_password(login_data.password, user.password_hash):
+    if not await run_in_threadpool(verify_password, login_data.password, user.password_hash):
         raise HTTPException(
             status_code=401,
             detail="invalid credentials"
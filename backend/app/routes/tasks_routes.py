@@ -1,70 +1,128 @@
 """
-Task routes using Beanie ODM 🐉
-Much cleaner than the previous PyMongo implementation!
+Task routes 🐉
+Storage goes through the task repository (MongoDB via Beanie, or in-memory)
 """
-from fastapi import APIRouter, HTTPException
-from typing import List as TypeList
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from typing import List as TypeList, Optional, Union
+from datetime import datetime
 from beanie import PydanticObjectId
 
+from app.core.admission import AdmissionController, register
+from app.core.single_flight import single_flight
+from app.core.write_coalescer import task_write_coalescer
 from app.models.task import Task, TaskCreateRequest, TaskUpdateRequest
+from app.models.task_projection import (
+    PartialTask, dump_task_json, dump_tasks_json, parse_task_fields, task_projection,
+)
+from app.repositories import task_repository
 
-router = APIRouter(tags=["tasks"])
+# Largest page a client may ask for in one list call
+MAX_LIST_LIMIT = 200
+
+# Admission control for every task route (override with ADMISSION_TASKS_* env vars)
+admission = register(AdmissionController.from_env(
+    "tasks", max_concurrency=64, max_queue_time=2.0, rate=50, burst=100,
+))
+
+router = APIRouter(tags=["tasks"], dependencies=[Depends(admission)])
+
+# Concurrent get_task calls for the same id share one database read
+task_reads = single_flight("task_get")
+
+# Query parameter shared by the read routes for sparse fieldsets
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated task fields to return, e.g. title,priority,deadline,completed (_id is always included)",
+)
+
+def resolve_projection(fields: Optional[str]):
+    """Validate ?fields= and return the slim projection model (None = full task)"""
+    try:
+        requested = parse_task_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return task_projection(requested) if requested is not None else None
 
 @router.post("/", response_model=Task, status_code=201)
 async def create_task(task_data: TaskCreateRequest):
     """Create a new task 🐉"""
     try:
-        # Create a new Task document directly from the request data
-        task = Task(**task_data.model_dump())
-        
-        # Save to database (Beanie handles all the MongoDB operations)
-        await task.create()
-        
-        return task
+        # Create and save a new Task document from the request data
+        return await task_repository().create(task_data.model_dump())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to create task: {e}")
 
-@router.get("/", response_model=TypeList[Task])
-async def list_tasks(limit: int = 50):
-    """List all tasks 🐉"""
-    # Beanie makes queries super clean!
-    tasks = await Task.find_all().sort(-Task.created_at).limit(limit).to_list()
+@router.get("/", response_model=TypeList[Union[Task, PartialTask]])
+async def list_tasks(
+    limit: int = Query(50, ge=1, le=MAX_LIST_LIMIT),
+    include_archived: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+):
+    """
+    List all tasks 🐉 (pass include_archived=true to also search the archive)
+
+    With ?fields= each item is a PartialTask: `_id` plus just the requested fields.
+    """
+    projection = resolve_projection(fields)
+    tasks = await task_repository().list(limit, include_archived=include_archived, projection=projection)
+    if projection:
+        # Slim tasks skip the full Task response model
+        return Response(dump_tasks_json(projection, tasks), media_type="application/json")
     return tasks
 
-@router.get("/{task_id}", response_model=Task)
-async def get_task(task_id: PydanticObjectId):
-    """Get a specific task by ID 🐉"""
-    task = await Task.get(task_id)
+@router.get("/{task_id}", response_model=Union[Task, PartialTask])
+async def get_task(
+    task_id: PydanticObjectId,
+    include_archived: bool = False,
+    fields: Optional[str] = FIELDS_QUERY,
+):
+    """
+    Get a specific task by ID 🐉 (pass include_archived=true to also search the archive)
+
+    With ?fields= the result is a PartialTask: `_id` plus just the requested fields.
+    """
+    projection = resolve_projection(fields)
+    tasks = task_repository()
+    task = await task_reads.do(
+        ("tasks", task_id, projection), lambda: tasks.get(task_id, projection=projection)
+    )
+    if not task and include_archived:
+        task = await task_reads.do(
+            ("tasks_archive", task_id, projection),
+            lambda: tasks.get(task_id, archived=True, projection=projection),
+        )
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    if projection:
+        return Response(dump_task_json(task), media_type="application/json")
     return task
 
 @router.patch("/{task_id}", response_model=Task)
 async def update_task(task_id: PydanticObjectId, task_update: TaskUpdateRequest):
     """Update a task with partial data (PATCH) 🐉"""
-    # Find the existing task
-    task = await Task.get(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
     # Get only the fields that were provided (exclude None values)
     update_data = task_update.model_dump(exclude_unset=True)
+    update_data["updated_at"] = datetime.now()  # the archiver ages tasks by this
     
-    # Update the task with new data
-    await task.update({"$set": update_data})
+    # Coalescing mode: merge with other PATCHes for this task and write once
+    if task_write_coalescer is not None:
+        task = await task_write_coalescer.submit(task_id, update_data)
+        if not task:
+            raise HTTPException(status_code=404, detail="Task not found")
+        return task
     
-    # Return the updated task (Beanie automatically refreshes it)
-    return await Task.get(task_id)
+    # Update the task with new data and return the refreshed task
+    task = await task_repository().update(task_id, update_data)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
 
 @router.delete("/{task_id}", status_code=204)
 async def delete_task(task_id: PydanticObjectId):
-    """Delete a task 🐉"""
-    task = await Task.get(task_id)
-    if not task:
-        raise HTTPException(status_code=404, detail="Task not found")
-    
+    """Delete a task 🐉 (archived tasks included)"""
     # Delete the task
-    await task.delete()
+    if not await task_repository().delete(task_id):
+        raise HTTPException(status_code=404, detail="Task not found")
     
     # Return 204 No Content on successful deletion
     return None
\ No newline at end of file
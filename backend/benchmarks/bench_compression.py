@@ -0,0 +1,85 @@
+"""
+Benchmark: response compression, bytes saved vs CPU cost 🐉
+
+Builds task-list JSON bodies like GET /tasks returns at several list sizes
+and runs them through each encoder the middleware can use, at a few
+levels. Prints compressed size, ratio and CPU time per response, to help
+pick COMPRESSION_MIN_SIZE and the levels for bandwidth-constrained clients.
+
+    python -m benchmarks.bench_compression
+    python -m benchmarks.bench_compression --sizes 1 10 100 --repeat 50
+"""
+import argparse
+import json
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from bson import ObjectId
+
+from app.core.compression import available_encoders
+from app.models.task import PriorityLevel
+from app.models.task_record import TaskRecord
+
+# Levels to try per encoding (fast / default-ish / high)
+LEVELS = {"gzip": [1, 6, 9], "br": [1, 4, 9], "zstd": [1, 3, 10]}
+
+WORDS = "plan review write call email fix deploy test design refactor meeting report budget".split()
+
+
+def task_list_json(count: int) -> bytes:
+    """JSON body for a list of `count` tasks, shaped like the API response"""
+    random.seed(count)
+    user_id = str(ObjectId())
+    tasks = []
+    for i in range(count):
+        created = datetime(2025, 1, 1) + timedelta(minutes=17 * i)
+        record = TaskRecord(
+            id=ObjectId().binary,
+            title=" ".join(random.choices(WORDS, k=3)).capitalize(),
+            description=" ".join(random.choices(WORDS, k=random.randint(0, 25))) or None,
+            priority=random.choice(list(PriorityLevel)),
+            deadline=(date(2025, 2, 1) + timedelta(days=i % 90)).toordinal(),
+            completed=random.random() < 0.3,
+            label_ids=(),
+            user_id=user_id,
+            created_at=int(created.timestamp() * 1_000_000),
+            updated_at=int(created.timestamp() * 1_000_000),
+        )
+        tasks.append(record.to_json())
+    return json.dumps(tasks).encode()
+
+
+def compress(encoder_class, level: int, body: bytes) -> bytes:
+    """One-shot compression, the same calls the middleware makes"""
+    encoder = encoder_class(level)
+    return encoder.compress(body) + encoder.finish()
+
+
+def main(sizes, repeat: int):
+    encoders = available_encoders()
+    missing = [name for name in LEVELS if name not in encoders]
+    if missing:
+        print(f"(skipping {', '.join(missing)}: optional package not installed)")
+
+    print(f"{'tasks':>6} {'raw B':>9} {'encoding':>9} {'level':>5} {'out B':>9} {'ratio':>6} {'saved B':>9} {'CPU us':>9}")
+    for size in sizes:
+        body = task_list_json(size)
+        for name, encoder_class in encoders.items():
+            for level in LEVELS[name]:
+                started = time.process_time()
+                for _ in range(repeat):
+                    data = compress(encoder_class, level, body)
+                cpu_us = (time.process_time() - started) / repeat * 1_000_000
+                print(
+                    f"{size:>6} {len(body):>9} {name:>9} {level:>5} {len(data):>9} "
+                    f"{len(body) / len(data):>6.1f} {len(body) - len(data):>9} {cpu_us:>9.0f}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 50, 200, 1000, 5000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.repeat)
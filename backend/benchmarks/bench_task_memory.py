@@ -0,0 +1,96 @@
+"""
+Benchmark: memory per cached task, TaskRecord vs Task Document 🐉
+
+Builds N tasks in each form and measures what they cost with tracemalloc.
+Tasks look like real ones: a short title, a description on most of them,
+a handful of users, a label or two.
+
+Documents are built with Task.model_construct() so no database is needed;
+that skips validation but produces the same in-memory object. Since a
+million Documents can take gigabytes, they are sampled at --documents and
+scaled to --records for the comparison.
+
+Both forms point at the same title/description strings from the raw docs,
+so the numbers compare per-task overhead rather than text size.
+
+    python -m benchmarks.bench_task_memory --records 1000000 --documents 100000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from bson import ObjectId
+
+from app.models.task import Task, PriorityLevel
+from app.models.task_record import TaskRecord
+
+USERS = [str(ObjectId()) for _ in range(50)]
+LABELS = [str(ObjectId()) for _ in range(20)]
+
+
+def fake_bson(i: int) -> dict:
+    """A raw `tasks` document like the ones Mongo hands back"""
+    created = datetime(2025, 1, 1) + timedelta(seconds=i)
+    return {
+        "_id": ObjectId(),
+        "title": f"Task number {i}",
+        "description": "Follow up on this" if i % 4 else None,
+        "priority": random.choice(["high", "medium", "low"]),
+        "deadline": datetime.combine(date(2025, 1, 1) + timedelta(days=i % 365), datetime.min.time()),
+        "completed": i % 3 == 0,
+        # Real ids come back from Mongo as fresh strings, so copy them
+        "label_ids": ["".join(label) for label in random.sample(LABELS, i % 3)],
+        "user_id": "".join(random.choice(USERS)),
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+def as_document(doc: dict) -> Task:
+    """Task document as Beanie would hold it after a read"""
+    fields = dict(doc)
+    fields["id"] = fields.pop("_id")
+    fields["priority"] = PriorityLevel(fields["priority"])
+    fields["deadline"] = fields["deadline"].date()
+    return Task.model_construct(**fields)
+
+
+def measure(build, count: int) -> int:
+    """Bytes allocated (and kept) by building `count` objects"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert len(objects) == count
+    del objects
+    return after - before
+
+
+def main(records: int, documents: int):
+    random.seed(0)
+    # Pre-build the raw docs so only the cached form is measured
+    raw = [fake_bson(i) for i in range(max(records, documents))]
+
+    record_bytes = measure(lambda i: TaskRecord.from_bson(raw[i]), records)
+    document_bytes = measure(lambda i: as_document(raw[i]), documents)
+
+    per_record = record_bytes / records
+    per_document = document_bytes / documents
+    print(f"TaskRecord: {per_record:8.0f} bytes/task  -> {per_record * records / 2**20:8.1f} MiB for {records:,} tasks")
+    print(
+        f"Task doc:   {per_document:8.0f} bytes/task  -> {per_document * records / 2**20:8.1f} MiB for {records:,} tasks"
+        f" (sampled at {documents:,})"
+    )
+    print(f"Savings:    {per_document / per_record:8.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=1_000_000)
+    parser.add_argument("--documents", type=int, default=100_000)
+    args = parser.parse_args()
+    main(args.records, args.documents)
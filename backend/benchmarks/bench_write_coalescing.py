@@ -0,0 +1,126 @@
+"""
+Benchmark: write coalescing vs the plain update_task path 🐉
+
+Simulates users hammering PATCH on a handful of tasks: `bursts` rounds,
+each firing `burst_size` concurrent patches at every task. Compares:
+
+- direct:    one repository update per patch (get -> $set -> get on Mongo)
+- coalesced: WriteCoalescer.submit per patch (one bulk_write per window)
+
+On Mongo, round trips are counted from the driver's command events.
+Run from backend/ against a scratch database:
+
+    MONGO_URI=... python -m benchmarks.bench_write_coalescing
+
+`--engine memory` only checks the harness: with no network in between,
+the window just adds waiting and coalescing always looks slower there.
+"""
+import argparse
+import asyncio
+import os
+import random
+import time
+from datetime import date
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from app.core.write_coalescer import WriteCoalescer, flush_task_updates
+from app.models.task import Task, PriorityLevel
+from app.repositories import configure_storage, task_repository
+
+
+def random_patch() -> dict:
+    """The kind of patch a UI fires while toggling/reordering"""
+    return random.choice([
+        {"completed": random.random() < 0.5},
+        {"priority": random.choice(list(PriorityLevel))},
+        {"title": f"renamed {random.randint(0, 999)}"},
+    ])
+
+
+class RoundTripCounter(monitoring.CommandListener):
+    """Counts commands the driver sends to the server"""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def direct_update(task_id, patch):
+    """Mirror of update_task without coalescing"""
+    return await task_repository().update(task_id, patch)
+
+
+async def run(update, task_ids, bursts, burst_size) -> float:
+    """Fire the synthetic load through `update`, return seconds taken"""
+    started = time.perf_counter()
+    for _ in range(bursts):
+        await asyncio.gather(*[
+            update(task_id, random_patch())
+            for task_id in task_ids
+            for _ in range(burst_size)
+        ])
+    return time.perf_counter() - started
+
+
+async def main(engine: str, tasks: int, bursts: int, burst_size: int, window_ms: float):
+    client = None
+    round_trips = RoundTripCounter()
+    if engine == "mongo":
+        client = AsyncIOMotorClient(os.environ["MONGO_URI"], event_listeners=[round_trips])
+        db_name = os.getenv("MONGO_DB_NAME_BENCH", "TodoAppAZNext_bench")
+        await init_beanie(database=client[db_name], document_models=[Task])
+    configure_storage(engine)
+
+    try:
+        task_ids = [
+            (await task_repository().create({
+                "title": f"task {i}", "priority": PriorityLevel.MEDIUM, "deadline": date(2030, 1, 1),
+            })).id
+            for i in range(tasks)
+        ]
+        patches = bursts * burst_size * len(task_ids)
+
+        round_trips.count = 0
+        direct = await run(direct_update, task_ids, bursts, burst_size)
+        direct_trips = round_trips.count
+
+        coalescer = WriteCoalescer(flush_task_updates, window_ms / 1000)
+        round_trips.count = 0
+        coalesced = await run(coalescer.submit, task_ids, bursts, burst_size)
+        coalesced_trips = round_trips.count
+        stats = coalescer.stats()
+
+        print(f"[{engine}] {patches} patches over {len(task_ids)} tasks ({bursts} bursts x {burst_size})")
+        direct_line = f"direct:    {direct:8.3f}s  {patches / direct:9.0f} patches/s"
+        coalesced_line = f"coalesced: {coalesced:8.3f}s  {patches / coalesced:9.0f} patches/s"
+        if engine == "mongo":
+            direct_line += f"  {direct_trips} round trips"
+            coalesced_line += f"  {coalesced_trips} round trips"
+        print(direct_line)
+        print(f"{coalesced_line}  ({stats['flushes']} flushes, {stats['written']} writes, window {window_ms}ms)")
+    finally:
+        if client is not None:
+            await client.drop_database(db_name)
+            client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--engine", choices=["mongo", "memory"], default="mongo")
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--bursts", type=int, default=50)
+    parser.add_argument("--burst-size", type=int, default=10)
+    parser.add_argument("--window-ms", type=float, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.engine, args.tasks, args.bursts, args.burst_size, args.window_ms))
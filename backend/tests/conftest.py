@@ -10,16 +10,33 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from beanie import init_beanie
 import os
 
+# Tests run on the in-memory storage engine by default: fast, no MongoDB needed.
+# Set TEST_STORAGE=mongo to run them against the live test database instead 🐉
+TEST_STORAGE = os.getenv("TEST_STORAGE", "memory")
+
 # Force test environment 🐉
-os.environ["APP_ENV"] = "test"
+os.environ["APP_ENV"] = "test" if TEST_STORAGE == "mongo" else "memory"
 
 from app.main import app
-from app.models.task import Task
+from app.models.task import Task, ArchivedTask
 from app.models.user import User
 
 # Configure pytest-asyncio
 pytest_plugins = ('pytest_asyncio',)
 
+def pytest_configure(config):
+    """Register the `mongo` marker for tests that need the real database 🐉"""
+    config.addinivalue_line("markers", "mongo: needs MongoDB (run with TEST_STORAGE=mongo)")
+
+def pytest_collection_modifyitems(config, items):
+    """Skip @pytest.mark.mongo tests unless we're running against MongoDB"""
+    if TEST_STORAGE == "mongo":
+        return
+    skip_mongo = pytest.mark.skip(reason="needs MongoDB (run with TEST_STORAGE=mongo)")
+    for item in items:
+        if "mongo" in item.keywords:
+            item.add_marker(skip_mongo)
+
 @pytest.fixture(scope="session")
 def event_loop():
     """Create an instance of the default event loop for the test session."""
@@ -31,6 +48,10 @@ def event_loop():
 @pytest.fixture(scope="session", autouse=True)
 async def init_test_db():
     """Initialize Beanie for the test session 🐉"""
+    if TEST_STORAGE != "mongo":
+        yield  # In-memory storage starts fresh with every app startup
+        return
+    
     # Get MongoDB URI from environment
     MONGO_URI = os.getenv("MONGO_URI")
     if not MONGO_URI:
@@ -44,7 +65,7 @@ async def init_test_db():
     database = client[TEST_DB_NAME]
     
     # Initialize Beanie with our document models
-    await init_beanie(database=database, document_models=[Task, User])
+    await init_beanie(database=database, document_models=[Task, ArchivedTask, User])
     
     print(f"Test database initialized: {TEST_DB_NAME}")
     
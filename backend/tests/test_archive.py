@@ -0,0 +1,80 @@
+"""
+Tests for archiving completed tasks 🐉
+"""
+from datetime import timedelta
+
+from beanie import PydanticObjectId
+
+from app.core.archiver import archive_completed_tasks
+from app.models.task import ArchivedTask
+from app.repositories import task_repository
+from app.repositories.memory import MemoryTaskRepository
+
+
+def run_archiver(client):
+    """Run one archive pass on the app's event loop (where the DB client lives)"""
+    return client.portal.call(lambda: archive_completed_tasks(older_than=timedelta(0), pause=0))
+
+
+def plant_archive_copy(client, task_id, **changes):
+    """Put an out-of-date copy of a hot task in the archive, as an interrupted move would"""
+    async def plant():
+        repo = task_repository()
+        task = await repo.get(PydanticObjectId(task_id))
+        fields = {**{name: getattr(task, name) for name in type(task).model_fields}, **changes}
+        if isinstance(repo, MemoryTaskRepository):
+            repo.archive.put(ArchivedTask.model_construct(**fields))
+        else:
+            await ArchivedTask(**fields).insert()
+    client.portal.call(plant)
+
+
+def test_completed_task_moves_to_archive(client, created_task):
+    """A completed task leaves the hot collection and is only visible with include_archived"""
+    task_id = created_task["_id"]
+    client.patch(f"/tasks/{task_id}", json={"completed": True})
+
+    assert run_archiver(client) >= 1
+
+    # Gone from normal reads...
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+    assert task_id not in [t["_id"] for t in client.get("/tasks/").json()]
+
+    # ...but still there when asked for explicitly
+    response = client.get(f"/tasks/{task_id}", params={"include_archived": "true"})
+    assert response.status_code == 200
+    assert response.json()["completed"] is True
+    listed = client.get("/tasks/", params={"include_archived": "true"}).json()
+    assert task_id in [t["_id"] for t in listed]
+
+
+def test_open_task_is_not_archived(client, created_task):
+    """Tasks that aren't completed stay in the hot collection"""
+    run_archiver(client)
+    assert client.get(f"/tasks/{created_task['_id']}").status_code == 200
+
+
+def test_rearchiving_replaces_stale_archive_copy(client, created_task):
+    """A task already in the archive is overwritten with the current hot copy, never lost"""
+    task_id = created_task["_id"]
+    client.patch(f"/tasks/{task_id}", json={"completed": True, "title": "Current title"})
+    plant_archive_copy(client, task_id, title="Stale title")
+
+    assert run_archiver(client) >= 1
+
+    assert client.get(f"/tasks/{task_id}").status_code == 404
+    response = client.get(f"/tasks/{task_id}", params={"include_archived": "true"})
+    assert response.json()["title"] == "Current title"
+    listed = client.get("/tasks/", params={"include_archived": "true"}).json()
+    assert [t["_id"] for t in listed].count(task_id) == 1
+
+
+def test_archived_task_can_be_deleted(client, created_task):
+    """DELETE reaches into the archive, since archived tasks are still readable"""
+    task_id = created_task["_id"]
+    client.patch(f"/tasks/{task_id}", json={"completed": True})
+    run_archiver(client)
+
+    assert client.delete(f"/tasks/{task_id}").status_code == 204
+    assert client.get(f"/tasks/{task_id}", params={"include_archived": "true"}).status_code == 404
+    assert client.delete(f"/tasks/{task_id}").status_code == 404
@@ -0,0 +1,50 @@
+"""
+Tests for the auth endpoints 🐉
+"""
+import asyncio
+
+import httpx
+
+from app.main import app
+
+
+def test_signup_and_login(client):
+    """Sign up, then log in with the same credentials"""
+    credentials = {"email": "dragon@example.com", "password": "supersecret"}
+
+    response = client.post("/auth/signup", json=credentials)
+    assert response.status_code == 201
+    user = response.json()
+    assert user["email"] == credentials["email"]
+    assert "password_hash" not in user
+
+    response = client.post("/auth/login", json=credentials)
+    assert response.status_code == 200
+    assert response.json()["id"] == user["id"]
+
+
+def test_signup_duplicate_email(client):
+    """Signing up twice with the same email is a 409"""
+    credentials = {"email": "twice@example.com", "password": "supersecret"}
+    assert client.post("/auth/signup", json=credentials).status_code == 201
+    assert client.post("/auth/signup", json=credentials).status_code == 409
+
+
+def test_concurrent_duplicate_signups(client):
+    """Signups racing past the existence check: one 201, the rest 409 (never a 500)"""
+    credentials = {"email": "racing@example.com", "password": "supersecret"}
+
+    async def race():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as http:
+            return await asyncio.gather(*[http.post("/auth/signup", json=credentials) for _ in range(3)])
+
+    responses = client.portal.call(race)
+    assert sorted(r.status_code for r in responses) == [201, 409, 409]
+    assert all(r.json()["detail"] == "email already registered" for r in responses if r.status_code == 409)
+
+
+def test_login_bad_credentials(client):
+    """Wrong password or unknown email is a 401"""
+    client.post("/auth/signup", json={"email": "known@example.com", "password": "supersecret"})
+    assert client.post("/auth/login", json={"email": "known@example.com", "password": "wrong"}).status_code == 401
+    assert client.post("/auth/login", json={"email": "nobody@example.com", "password": "whatever"}).status_code == 401
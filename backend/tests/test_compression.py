@@ -0,0 +1,105 @@
+"""
+Tests for response compression 🐉
+These use a tiny throwaway app so they don't touch the task routes.
+"""
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, choose_encoding
+
+BIG_PAYLOAD = [{"title": f"Task {i}", "priority": "medium", "completed": False} for i in range(200)]
+
+
+def make_client(**options) -> TestClient:
+    """App with a big JSON route, a small one, and a streamed one"""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, **options)
+
+    @app.get("/big")
+    async def big():
+        return BIG_PAYLOAD
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for item in BIG_PAYLOAD:
+                yield json.dumps(item) + "\n"
+        return StreamingResponse(lines(), media_type="text/plain")
+
+    return TestClient(app)
+
+
+def raw_get(client: TestClient, path: str, accept_encoding: str):
+    """GET without httpx decoding the body for us"""
+    with client.stream("GET", path, headers={"Accept-Encoding": accept_encoding}) as response:
+        return response, b"".join(response.iter_raw())
+
+
+def test_choose_encoding_honours_quality():
+    """q-values win over our preference order, q=0 means never"""
+    offered = ["zstd", "br", "gzip"]
+    assert choose_encoding("gzip, br", offered) == "br"
+    assert choose_encoding("br;q=0.5, gzip", offered) == "gzip"
+    assert choose_encoding("gzip;q=0", offered) is None
+    assert choose_encoding("*", offered) == "zstd"
+    assert choose_encoding("", offered) is None
+
+
+def test_large_json_is_gzipped():
+    """Big responses are compressed with an exact Content-Length"""
+    client = make_client(encodings=["gzip"])
+    response, body = raw_get(client, "/big", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert int(response.headers["content-length"]) == len(body)
+    assert json.loads(gzip.decompress(body)) == BIG_PAYLOAD
+
+
+def test_small_and_unaccepted_responses_are_left_alone():
+    """Below the threshold, or when the client can't decode it, we send plain bytes"""
+    client = make_client(encodings=["gzip"], minimum_size=500)
+    response, body = raw_get(client, "/small", "gzip")
+    assert "content-encoding" not in response.headers
+    assert json.loads(body) == {"ok": True}
+
+    response, body = raw_get(client, "/big", "identity")
+    assert "content-encoding" not in response.headers
+    assert json.loads(body) == BIG_PAYLOAD
+
+
+def test_streamed_response_is_compressed():
+    """Streaming responses are compressed chunk by chunk"""
+    client = make_client(encodings=["gzip"])
+    response, body = raw_get(client, "/stream", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    lines = gzip.decompress(body).decode().splitlines()
+    assert [json.loads(line) for line in lines] == BIG_PAYLOAD
+
+
+def test_brotli():
+    """br is used when the client prefers it"""
+    brotli = pytest.importorskip("brotli")
+    client = make_client(encodings=["br", "gzip"])
+    response, body = raw_get(client, "/big", "gzip;q=0.5, br")
+    assert response.headers["content-encoding"] == "br"
+    assert json.loads(brotli.decompress(body)) == BIG_PAYLOAD
+
+
+def test_zstd_streaming():
+    """zstd frames from a streamed response decode back to the original"""
+    zstandard = pytest.importorskip("zstandard")
+    client = make_client(encodings=["zstd"])
+    response, body = raw_get(client, "/stream", "zstd")
+    assert response.headers["content-encoding"] == "zstd"
+    data = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    assert [json.loads(line) for line in data.decode().splitlines()] == BIG_PAYLOAD
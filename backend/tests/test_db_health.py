@@ -15,6 +15,8 @@ def test_general_health_check(client: TestClient):
     assert "message" in data
 
 
+# Checks the real test database, so it only runs with TEST_STORAGE=mongo
+@pytest.mark.mongo
 def test_general_db_test(client: TestClient):
     """Test the general database test endpoint"""
     response = client.get("/db-test")
@@ -27,6 +29,7 @@ def test_general_db_test(client: TestClient):
     assert "collections" in data
 
 
+@pytest.mark.mongo
 def test_test_db_health_comprehensive(client: TestClient):
     """Comprehensive test for the test-specific database health check endpoint 🐉"""
     response = client.get("/test-db-health")
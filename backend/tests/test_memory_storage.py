@@ -0,0 +1,133 @@
+"""
+Tests for the in-memory storage engine 🐉
+"""
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+from app.models.task import PriorityLevel
+from app.repositories.base import TaskRepository
+from app.repositories.memory import MemoryTaskRepository, MemoryUserRepository, SortedIndex
+
+
+def new_task(title, **extra):
+    """Validated create data, like TaskCreateRequest.model_dump() gives us"""
+    return {"title": title, "description": None, "priority": PriorityLevel.LOW, "deadline": date(2025, 1, 1), **extra}
+
+
+def test_indexes_mirror_task_settings():
+    """One sorted index per entry in Task.Settings.indexes"""
+    repo = MemoryTaskRepository()
+    assert [index.fields for index in repo.tasks.indexes] == [
+        ["user_id"],
+        ["user_id", "completed"],
+        ["user_id", "deadline"],
+        ["label_ids"],
+        ["completed", "updated_at"],
+    ]
+
+
+def test_filters_use_indexes_and_return_newest_first():
+    """user_id / completed filters come back newest first"""
+    repo = MemoryTaskRepository()
+
+    async def scenario():
+        a = await repo.create(new_task("a", user_id="u1"))
+        b = await repo.create(new_task("b", user_id="u2"))
+        c = await repo.create(new_task("c", user_id="u1"))
+        await repo.update(a.id, {"completed": True})
+        return (
+            await repo.list(10, user_id="u1"),
+            await repo.list(10, user_id="u1", completed=False),
+            await repo.list(10, completed=True),
+            await repo.list(2),
+            b,
+        )
+
+    mine, open_mine, done, newest, b = asyncio.run(scenario())
+    assert [t.title for t in mine] == ["c", "a"]
+    assert [t.title for t in open_mine] == ["c"]
+    assert [t.title for t in done] == ["a"]
+    assert [t.title for t in newest] == ["c", "b"]
+
+
+def test_multikey_label_index():
+    """A task with several labels is found under each of them"""
+    index = SortedIndex(["label_ids"])
+    repo = MemoryTaskRepository()
+
+    async def scenario():
+        return await repo.create(new_task("t", label_ids=["work", "urgent"]))
+
+    task = asyncio.run(scenario())
+    index.add(task)
+    assert index.lookup("work") == [task.id]
+    assert index.lookup("urgent") == [task.id]
+    index.remove(task)
+    assert index.entries == []
+
+
+def test_update_keeps_indexes_in_sync():
+    """Changing an indexed field moves the task in the index"""
+    repo = MemoryTaskRepository()
+
+    async def scenario():
+        task = await repo.create(new_task("t", user_id="u1"))
+        await repo.update(task.id, {"completed": True})
+        return task, await repo.list(10, user_id="u1", completed=False), await repo.list(10, user_id="u1", completed=True)
+
+    task, still_open, done = asyncio.run(scenario())
+    assert still_open == []
+    assert [t.id for t in done] == [task.id]
+    assert len(repo.tasks.by_created_at.entries) == 1
+
+
+def test_archive_uses_completed_updated_at_index():
+    """Only completed tasks older than the cutoff move, oldest first, batch by batch"""
+    repo = MemoryTaskRepository()
+    cutoff = datetime(2025, 6, 1)
+
+    async def scenario():
+        oldest = await repo.create(new_task("oldest", completed=True, updated_at=datetime(2025, 1, 1)))
+        older = await repo.create(new_task("older", completed=True, updated_at=datetime(2025, 2, 1)))
+        await repo.create(new_task("recent", completed=True, updated_at=cutoff))
+        await repo.create(new_task("open", updated_at=datetime(2025, 1, 1)))
+        index = repo.tasks.index_on(["completed", "updated_at"])
+        assert index.lookup_below(True, below=cutoff) == [oldest.id, older.id]
+
+        first = await repo.archive_completed(cutoff, batch_size=1)
+        moved_first = list(repo.archive.docs)
+        second = await repo.archive_completed(cutoff, batch_size=1)
+        third = await repo.archive_completed(cutoff, batch_size=1)
+        return oldest, older, first, moved_first, second, third
+
+    oldest, older, first, moved_first, second, third = asyncio.run(scenario())
+    assert (first, second, third) == (1, 1, 0)
+    assert moved_first == [oldest.id]
+    assert set(repo.archive.docs) == {oldest.id, older.id}
+    assert sorted(task.title for task in repo.tasks.docs.values()) == ["open", "recent"]
+
+
+def test_user_email_is_unique():
+    """Creating a second user with the same email fails like the Mongo unique index"""
+    repo = MemoryUserRepository()
+
+    async def scenario():
+        await repo.create({"email": "a@example.com", "password_hash": "x"})
+        await repo.create({"email": "a@example.com", "password_hash": "y"})
+
+    with pytest.raises(DuplicateKeyError):
+        asyncio.run(scenario())
+    assert asyncio.run(repo.get_by_email("a@example.com")).password_hash == "x"
+
+
+def test_incomplete_engine_fails_on_creation():
+    """A repository missing a method can't even be instantiated"""
+    class HalfDone(TaskRepository):
+        async def create(self, data):
+            return None
+
+    with pytest.raises(TypeError):
+        HalfDone()
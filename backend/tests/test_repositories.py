@@ -0,0 +1,149 @@
+"""
+Tests for the storage engines behind task_repository() 🐉
+These run on whichever engine the suite uses, so TEST_STORAGE=mongo covers
+the Beanie code in app/repositories/mongo.py (bulk writes, projections,
+archive moves). The @pytest.mark.mongo ones only make sense on MongoDB.
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from app.models.task import Task, ArchivedTask, PriorityLevel
+from app.models.task_projection import task_projection
+from app.repositories import task_repository
+
+OLD = datetime.now() - timedelta(days=1)
+
+
+def new_task(title, **extra):
+    """Validated create data, like TaskCreateRequest.model_dump() gives us"""
+    return {"title": title, "description": None, "priority": PriorityLevel.LOW, "deadline": date(2030, 1, 1), **extra}
+
+
+def on_app_loop(client, scenario):
+    """Run an async scenario on the app's event loop (where the DB client lives)"""
+    return client.portal.call(scenario)
+
+
+def test_bulk_update_writes_every_patch(client):
+    """One bulk write, and every existing task comes back updated"""
+    async def scenario():
+        repo = task_repository()
+        a = await repo.create(new_task("a"))
+        b = await repo.create(new_task("b"))
+        results = await repo.bulk_update({
+            a.id: {"completed": True},
+            b.id: {"title": "b2", "priority": PriorityLevel.HIGH},
+        })
+        stored = [await repo.get(a.id), await repo.get(b.id)]
+        for task in (a, b):
+            await repo.delete(task.id)
+        return results, stored
+
+    results, (a, b) = on_app_loop(client, scenario)
+    assert results[a.id].completed is True
+    assert (results[b.id].title, results[b.id].priority) == ("b2", PriorityLevel.HIGH)
+    assert a.completed is True and b.title == "b2"
+
+
+def test_projection_returns_only_requested_fields(client):
+    """Projected reads hand back the slim model, not full Tasks"""
+    projection = task_projection(frozenset({"title"}))
+
+    async def scenario():
+        repo = task_repository()
+        task = await repo.create(new_task("projected", description="not wanted"))
+        one = await repo.get(task.id, projection=projection)
+        listed = await repo.list(200, projection=projection)
+        await repo.delete(task.id)
+        return task, one, listed
+
+    task, one, listed = on_app_loop(client, scenario)
+    assert type(one) is projection and not isinstance(one, Task)
+    assert (one.id, one.title) == (task.id, "projected")
+    assert "description" not in one.model_dump()
+    assert task.id in [t.id for t in listed]
+
+
+def test_archive_moves_only_old_completed_tasks(client):
+    """Old completed tasks move, recent or open ones stay hot"""
+    async def scenario():
+        repo = task_repository()
+        old_done = await repo.create(new_task("old done", completed=True, updated_at=OLD))
+        new_done = await repo.create(new_task("new done", completed=True))
+        old_open = await repo.create(new_task("old open", updated_at=OLD))
+        moved = await repo.archive_completed(datetime.now() - timedelta(hours=1), 100)
+        state = {
+            task.title: (await repo.get(task.id) is not None, await repo.get(task.id, archived=True) is not None)
+            for task in (old_done, new_done, old_open)
+        }
+        for task in (new_done, old_open):
+            await repo.delete(task.id)
+        return moved, state
+
+    moved, state = on_app_loop(client, scenario)
+    assert moved >= 1
+    assert state == {
+        "old done": (False, True),   # archived only
+        "new done": (True, False),   # too recent
+        "old open": (True, False),   # not completed
+    }
+
+
+@pytest.mark.mongo
+def test_archive_keeps_task_edited_mid_move(client, monkeypatch):
+    """A PATCH between copying and deleting wins: the task stays hot and leaves the archive"""
+    async def scenario():
+        repo = task_repository()
+        task = await repo.create(new_task("racing", completed=True, updated_at=OLD))
+
+        # Land an edit right after the archive copy is written
+        archive = ArchivedTask.get_motor_collection()
+        write_archive = archive.bulk_write
+
+        async def bulk_write_then_edit(*args, **kwargs):
+            result = await write_archive(*args, **kwargs)
+            await repo.update(task.id, {"title": "edited", "completed": False, "updated_at": datetime.now()})
+            return result
+
+        monkeypatch.setattr(archive, "bulk_write", bulk_write_then_edit)
+        moved = await repo.archive_completed(datetime.now() - timedelta(hours=1), 100)
+        monkeypatch.undo()
+
+        hot = await repo.get(task.id)
+        archived = await repo.get(task.id, archived=True)
+        await repo.delete(task.id)
+        return moved, hot, archived
+
+    moved, hot, archived = on_app_loop(client, scenario)
+    assert moved == 0
+    assert hot.title == "edited"
+    assert archived is None
+
+
+@pytest.mark.mongo
+def test_archive_does_not_resurrect_task_deleted_mid_move(client, monkeypatch):
+    """A task deleted between copying and deleting stays gone from both collections"""
+    async def scenario():
+        repo = task_repository()
+        task = await repo.create(new_task("deleted", completed=True, updated_at=OLD))
+
+        # The owner deletes it right after the archive copy is written
+        archive = ArchivedTask.get_motor_collection()
+        write_archive = archive.bulk_write
+
+        async def bulk_write_then_delete(*args, **kwargs):
+            result = await write_archive(*args, **kwargs)
+            await Task.get_motor_collection().delete_one({"_id": task.id})
+            return result
+
+        monkeypatch.setattr(archive, "bulk_write", bulk_write_then_delete)
+        moved = await repo.archive_completed(datetime.now() - timedelta(hours=1), 100)
+        monkeypatch.undo()
+
+        return moved, await repo.get(task.id), await repo.get(task.id, archived=True)
+
+    moved, hot, archived = on_app_loop(client, scenario)
+    assert moved == 0
+    assert hot is None
+    assert archived is None
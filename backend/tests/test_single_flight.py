@@ -0,0 +1,81 @@
+"""
+Tests for single-flight read coalescing 🐉
+"""
+import asyncio
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_execution():
+    """Many callers for the same key -> one call, same result for everyone"""
+    group = SingleFlight("test")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"id": "a"}
+
+    async def burst():
+        return await asyncio.gather(*[group.do("a", load) for _ in range(10)])
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(r is results[0] for r in results)
+    assert group.stats() == {"calls": 10, "executions": 1, "deduplicated": 9, "in_flight": 0}
+
+
+def test_different_keys_run_separately():
+    """Only identical keys are merged"""
+    group = SingleFlight("test")
+
+    async def burst():
+        return await asyncio.gather(
+            group.do("a", lambda: asyncio.sleep(0.01, result="A")),
+            group.do("b", lambda: asyncio.sleep(0.01, result="B")),
+        )
+
+    assert asyncio.run(burst()) == ["A", "B"]
+    assert group.stats()["executions"] == 2
+
+
+def test_error_is_shared_and_not_remembered():
+    """Everyone waiting gets the error, and the next call tries again"""
+    group = SingleFlight("test")
+    attempts = []
+
+    async def flaky():
+        attempts.append(1)
+        await asyncio.sleep(0.01)
+        if len(attempts) == 1:
+            raise RuntimeError("db hiccup")
+        return "ok"
+
+    async def scenario():
+        first = await asyncio.gather(group.do("a", flaky), group.do("a", flaky), return_exceptions=True)
+        second = await group.do("a", flaky)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in first)
+    assert second == "ok"
+    assert len(attempts) == 2
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    """If the caller that started the call goes away, the rest still get the result"""
+    group = SingleFlight("test")
+
+    async def scenario():
+        starter = asyncio.ensure_future(group.do("a", lambda: asyncio.sleep(0.02, result="done")))
+        await asyncio.sleep(0)
+        joiner = asyncio.ensure_future(group.do("a", lambda: asyncio.sleep(0.02, result="other")))
+        await asyncio.sleep(0)
+        starter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await starter
+        return await joiner
+
+    assert asyncio.run(scenario()) == "done"
@@ -0,0 +1,68 @@
+"""
+Tests for the compact TaskRecord 🐉
+"""
+from datetime import date, datetime
+
+import pytest
+from bson import ObjectId
+
+from app.models.task import Task, PriorityLevel
+from app.models.task_record import TaskRecord
+
+
+@pytest.fixture
+def raw_task():
+    """A raw `tasks` document as Mongo returns it"""
+    return {
+        "_id": ObjectId(),
+        "title": "Write report",
+        "description": "Quarterly numbers",
+        "priority": "high",
+        "deadline": datetime(2025, 10, 1),
+        "completed": False,
+        "label_ids": ["work"],
+        "user_id": "user-1",
+        "created_at": datetime(2025, 9, 1, 12, 30, 15, 123456),
+        "updated_at": datetime(2025, 9, 2, 8, 0, 0, 1),
+    }
+
+
+def test_bson_round_trip(raw_task):
+    """Raw Mongo doc -> record -> raw Mongo doc is lossless"""
+    record = TaskRecord.from_bson(raw_task)
+    assert record.to_bson() == raw_task
+
+
+def test_record_is_compact_and_immutable(raw_task):
+    """No per-instance dict, interned enum, and fields can't be reassigned"""
+    record = TaskRecord.from_bson(raw_task)
+    assert not hasattr(record, "__dict__")
+    assert record.priority is PriorityLevel.HIGH
+    assert record.deadline_date == date(2025, 10, 1)
+    with pytest.raises(AttributeError):
+        record.title = "changed"
+
+
+def test_user_ids_are_shared(raw_task):
+    """The same user id from two documents ends up as one string object"""
+    other = dict(raw_task, _id=ObjectId(), user_id="".join(["user-", "1"]))
+    assert TaskRecord.from_bson(raw_task).user_id is TaskRecord.from_bson(other).user_id
+
+
+def test_json_round_trip_matches_api_shape(raw_task):
+    """to_json() uses the same keys/format as the Task API response"""
+    record = TaskRecord.from_bson(raw_task)
+    data = record.to_json()
+    assert data["_id"] == str(raw_task["_id"])
+    assert data["deadline"] == "2025-10-01"
+    assert data["priority"] == "high"
+    assert data["created_at"] == "2025-09-01T12:30:15.123456"
+    assert TaskRecord.from_json(data) == record
+
+
+def test_from_document(raw_task):
+    """A Task document converts to the same record as its raw form"""
+    fields = dict(raw_task, id=raw_task["_id"], deadline=date(2025, 10, 1), priority=PriorityLevel.HIGH)
+    del fields["_id"]
+    task = Task.model_construct(**fields)
+    assert TaskRecord.from_document(task) == TaskRecord.from_bson(raw_task)
@@ -129,3 +129,47 @@ def test_delete_task_invalid_id(client):
     """Test deleting with invalid ID format"""
     response = client.delete("/tasks/invalid-id")
     assert response.status_code == 422  # Pydantic validation error
+
+def test_list_tasks_with_fields(client, created_task):
+    """?fields= returns only the requested fields (plus _id)"""
+    response = client.get("/tasks/", params={"fields": "title,priority,deadline,completed"})
+    assert response.status_code == 200
+    first_task = response.json()[0]
+    
+    assert set(first_task) == {"_id", "title", "priority", "deadline", "completed"}
+    assert first_task["_id"] == created_task["_id"]
+    assert first_task["deadline"] == created_task["deadline"]
+
+def test_get_task_with_fields(client, created_task):
+    """?fields= works for a single task too"""
+    # Compare with a stored read: MongoDB keeps datetimes to the millisecond
+    stored = client.get(f"/tasks/{created_task['_id']}").json()
+    response = client.get(f"/tasks/{created_task['_id']}", params={"fields": "title,created_at"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "_id": stored["_id"],
+        "title": stored["title"],
+        "created_at": stored["created_at"],
+    }
+
+def test_fields_unknown_field(client):
+    """Fields that aren't on the Task schema are rejected"""
+    response = client.get("/tasks/", params={"fields": "title,password"})
+    assert response.status_code == 422
+    assert "password" in response.json()["detail"]
+
+def test_fields_empty_is_rejected(client):
+    """An empty field list is a 422, not a list of bare _ids"""
+    for fields in ("", ",", " , "):
+        response = client.get("/tasks/", params={"fields": fields})
+        assert response.status_code == 422
+        assert "at least one" in response.json()["detail"]
+
+def test_fields_response_shape_is_documented(client):
+    """The OpenAPI schema says read routes may return PartialTask as well as Task"""
+    schema = client.get("/openapi.json").json()
+    get_schema = schema["paths"]["/tasks/{task_id}"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/PartialTask"} in get_schema["anyOf"]
+    list_schema = schema["paths"]["/tasks/"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert {"$ref": "#/components/schemas/PartialTask"} in list_schema["items"]["anyOf"]
+    assert schema["components"]["schemas"]["PartialTask"]["required"] == ["_id"]
@@ -0,0 +1,147 @@
+"""
+Tests for write coalescing 🐉
+Most use a plain dict "store" as the flush function so they don't need the
+database; the route tests at the bottom go through PATCH /tasks/{id}.
+"""
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.write_coalescer import WriteCoalescer, flush_task_updates
+from app.main import app
+from app.routes import tasks_routes
+
+
+def make_coalescer(store, window=0.01):
+    """Coalescer whose flush applies patches to `store` and records each flush"""
+    flushed = []
+
+    async def flush(patches):
+        flushed.append(dict(patches))
+        for key, patch in patches.items():
+            if key in store:
+                store[key].update(patch)
+        return {key: dict(store[key]) for key in patches if key in store}
+
+    return WriteCoalescer(flush, window), flushed
+
+
+def test_burst_for_same_task_is_one_write_last_writer_wins():
+    """Rapid patches to one task merge per field and flush once"""
+    store = {"a": {"title": "t", "completed": False, "priority": "low"}}
+    coalescer, flushed = make_coalescer(store)
+
+    async def burst():
+        return await asyncio.gather(
+            coalescer.submit("a", {"completed": True}),
+            coalescer.submit("a", {"completed": False, "priority": "high"}),
+            coalescer.submit("a", {"completed": True}),
+        )
+
+    results = asyncio.run(burst())
+
+    assert flushed == [{"a": {"completed": True, "priority": "high"}}]
+    # Every caller sees the merged result
+    for result in results:
+        assert result == {"title": "t", "completed": True, "priority": "high"}
+    assert coalescer.stats()["coalesced"] == 2
+
+
+def test_different_tasks_share_a_flush_and_missing_ones_get_none():
+    """All tasks touched in a window go out in the same flush"""
+    store = {"a": {"completed": False}, "b": {"completed": False}}
+    coalescer, flushed = make_coalescer(store)
+
+    async def burst():
+        return await asyncio.gather(
+            coalescer.submit("a", {"completed": True}),
+            coalescer.submit("b", {"completed": True}),
+            coalescer.submit("missing", {"completed": True}),
+        )
+
+    a, b, missing = asyncio.run(burst())
+    assert len(flushed) == 1
+    assert a == {"completed": True} and b == {"completed": True}
+    assert missing is None
+
+
+def test_flush_error_reaches_every_caller():
+    """If the write fails, everyone waiting on it gets the error"""
+    async def broken_flush(patches):
+        raise RuntimeError("db down")
+
+    coalescer = WriteCoalescer(broken_flush, 0.01)
+
+    async def burst():
+        return await asyncio.gather(
+            coalescer.submit("a", {"completed": True}),
+            coalescer.submit("a", {"completed": False}),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(burst())
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+def test_separate_windows_flush_separately():
+    """Patches after a flush start a new window"""
+    store = {"a": {"completed": False}}
+    coalescer, flushed = make_coalescer(store)
+
+    async def two_windows():
+        await coalescer.submit("a", {"completed": True})
+        await coalescer.submit("a", {"completed": False})
+
+    asyncio.run(two_windows())
+    assert len(flushed) == 2
+    assert store["a"]["completed"] is False
+
+
+@pytest.mark.parametrize("window", [0.0, 0.005])
+def test_window_sizes(window):
+    """Zero-length windows still work (flush on the next loop turn)"""
+    store = {"a": {"n": 0}}
+    coalescer, flushed = make_coalescer(store, window=window)
+    result = asyncio.run(coalescer.submit("a", {"n": 1}))
+    assert result == {"n": 1}
+
+
+@pytest.fixture
+def coalescing_routes(monkeypatch):
+    """Turn on coalescing for update_task, as TASK_WRITE_COALESCE_MS > 0 would"""
+    coalescer = WriteCoalescer(flush_task_updates, 0.01)
+    monkeypatch.setattr(tasks_routes, "task_write_coalescer", coalescer)
+    return coalescer
+
+
+def concurrent_patches(client, task_id, patches):
+    """Fire PATCHes at one task all at once, on the app's event loop"""
+    async def fire():
+        async with httpx.AsyncClient(app=app, base_url="http://test") as http:
+            return await asyncio.gather(*[
+                http.patch(f"/tasks/{task_id}", json=patch) for patch in patches
+            ])
+    return client.portal.call(fire)
+
+
+def test_concurrent_patches_share_the_merged_task(client, created_task, coalescing_routes):
+    """Every caller of a burst gets the same task with all patches merged"""
+    responses = concurrent_patches(client, created_task["_id"], [
+        {"title": "first"},
+        {"priority": "high"},
+        {"title": "last", "completed": True},
+    ])
+
+    assert [r.status_code for r in responses] == [200, 200, 200]
+    bodies = [r.json() for r in responses]
+    assert bodies[0] == bodies[1] == bodies[2]
+    assert (bodies[0]["title"], bodies[0]["priority"], bodies[0]["completed"]) == ("last", "high", True)
+    assert coalescing_routes.stats()["flushes"] == 1
+    assert client.get(f"/tasks/{created_task['_id']}").json()["title"] == "last"
+
+
+def test_coalesced_patch_of_missing_task_is_404(client, coalescing_routes):
+    """A task that doesn't exist still maps to 404 through the coalescer"""
+    responses = concurrent_patches(client, "123456789012345678901234", [{"title": "nope"}])
+    assert responses[0].status_code == 404